@@ -6,6 +6,7 @@ Tests multiple instances and generates comparison table
 import os
 import time
 import json
+import logging
 from typing import Dict, List
 from data_loader import Instance
 from iterated_local_search import IteratedLocalSearch
@@ -252,6 +253,8 @@ def main():
     """Main function to run batch testing"""
     import sys
     
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     # Parse command line arguments
     if len(sys.argv) > 1:
         max_instances = int(sys.argv[1]) if sys.argv[1] != 'all' else None
@@ -118,6 +118,16 @@ class GreedyInsertion(ConstructionHeuristic):
         routes = []
         unvisited_pairs = self.instance.get_pickup_delivery_pairs()
         
+        # Neither depends on the routes built so far, so both are worked out
+        # once instead of per pair and round
+        nodes = self.instance.nodes
+        new_route_costs = {(pickup_idx, delivery_idx): self.create_new_route_cost(nodes[pickup_idx], nodes[delivery_idx])
+                           for pickup_idx, delivery_idx in unvisited_pairs}
+        
+        # Set realistic minimum vehicles based on instance size
+        min_vehicles_needed = max(3, len(unvisited_pairs) // 12)  # At least 1 vehicle per 12 pairs
+        max_vehicles_allowed = len(unvisited_pairs) // 3  # At most 1 vehicle per 3 pairs
+        
         while unvisited_pairs:
             best_cost = float('inf')
             best_pair = None
@@ -141,11 +151,7 @@ class GreedyInsertion(ConstructionHeuristic):
                                 best_position = pos
                 
                 # Try creating new route
-                new_route_cost = self.create_new_route_cost(pickup_node, delivery_node)
-                
-                # Set realistic minimum vehicles based on instance size
-                min_vehicles_needed = max(3, len(self.instance.get_pickup_delivery_pairs()) // 12)  # At least 1 vehicle per 12 pairs
-                max_vehicles_allowed = len(self.instance.get_pickup_delivery_pairs()) // 3  # At most 1 vehicle per 3 pairs
+                new_route_cost = new_route_costs[pickup_idx, delivery_idx]
                 
                 # Strongly encourage creating new routes when we have too few vehicles
                 if len(routes) < min_vehicles_needed:
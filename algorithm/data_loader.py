@@ -5,7 +5,8 @@ Adapted from the validator.py code to understand instance structure
 
 import re
 import math
-from typing import List, Dict, Tuple, Optional
+from operator import getitem
+from typing import Iterable, List, Dict, Tuple, Optional
 
 
 class Node:
@@ -44,7 +45,7 @@ class Instance:
         self.route_time = 0
         self.time_window = 0
         self.nodes = []                 # list of Node objects
-        self.times = []                 # travel time matrix
+        self.times = []                 # travel time matrix (list of int lists)
         
     @property
     def distance_matrix(self):
@@ -138,11 +139,12 @@ class Instance:
             while line != "EDGES":
                 line = f.readline().strip()
                 
-            # Read travel time matrix
+            # Read travel time matrix; rows stay plain lists, which index
+            # faster than packed arrays in the solvers' inner loops
             self.times = []
             for _ in range(self.size):
                 line = f.readline()
-                row = [int(x) for x in line.split()]
+                row = list(map(int, line.split()))
                 self.times.append(row)
                 
     def get_travel_time(self, from_node: int, to_node: int) -> int:
@@ -184,12 +186,15 @@ class Instance:
         
 class Solution:
     """Represents a PDPTW solution"""
+    __slots__ = ('inst_name', 'authors', 'date', 'reference', 'routes', '_cost_cache')
+    
     def __init__(self):
         self.inst_name = ""
         self.authors = ""
         self.date = ""
         self.reference = ""
         self.routes = []               # list of routes, each route is list of node indices
+        self._cost_cache = None        # (instance, routes snapshot, route costs, cost) of the last get_cost
         
     def read_from_file(self, filename: str):
         """Read solution from file"""
@@ -237,23 +242,72 @@ class Solution:
                         
     def get_cost(self, instance: Instance) -> int:
         """Calculate total cost of solution"""
-        total_cost = 0
+        # Routes are edited in place all over the solver, so the cache is
+        # keyed on a snapshot of their contents rather than on identity
+        snapshot = tuple(map(tuple, self.routes))
+        cached = self._cost_cache
+        known = {}
+        if cached is not None and cached[0] is instance:
+            if cached[1] == snapshot:
+                return cached[3]
+            # Only routes that changed since the last call are re-summed
+            known = dict(zip(cached[1], cached[2]))
         
-        for route in self.routes:
-            if len(route) == 1:  # Single depot route
-                continue
-                
-            # Add travel from depot to first node
-            prev_node = 0
-            for node_id in route:
-                total_cost += instance.get_travel_time(prev_node, node_id)
-                prev_node = node_id
-                
-            # Add travel from last node back to depot  
-            if route[-1] != 0:
-                total_cost += instance.get_travel_time(route[-1], 0)
-                
+        route_costs = [known[route] if route in known else self._route_cost(route, instance)
+                       for route in snapshot]
+        total_cost = sum(route_costs)
+        
+        self._cost_cache = (instance, snapshot, route_costs, total_cost)
         return total_cost
+    
+    @staticmethod
+    def _route_cost(route, instance: Instance) -> int:
+        """Travel time of one route from and back to the depot"""
+        if len(route) == 1:  # Single depot route
+            return 0
+        
+        # Sum the edges straight off the matrix rows, instead of one method
+        # call per edge
+        path = [0, *route]
+        if route[-1] != 0:
+            path.append(0)
+        
+        times = instance.times
+        if times and min(route) >= 0 and max(route) < min(len(times), len(times[0])):
+            return sum(map(getitem, map(times.__getitem__, path[:-1]), path[1:]))
+        # Out-of-range ids go through get_travel_time for its penalty
+        return sum(map(instance.get_travel_time, path[:-1], path[1:]))
+        
+    def clone(self) -> 'Solution':
+        """Copy with its own route lists; the cost cache stays valid and is kept"""
+        new = Solution.__new__(Solution)
+        new.inst_name = self.inst_name
+        new.authors = self.authors
+        new.date = self.date
+        new.reference = self.reference
+        new.routes = list(map(list, self.routes))
+        new._cost_cache = self._cost_cache
+        return new
+    
+    def clone_shallow(self, touched_route_indices: Iterable[int] = ()) -> 'Solution':
+        """
+        Copy that shares every route list except the touched ones
+        
+        For moves that edit a route or two in place: only those get their
+        own lists, the rest stay shared with this solution and must not be
+        edited. Indices past the last route are ignored.
+        """
+        new = Solution.__new__(Solution)
+        new.inst_name = self.inst_name
+        new.authors = self.authors
+        new.date = self.date
+        new.reference = self.reference
+        routes = new.routes = self.routes[:]
+        for idx in touched_route_indices:
+            if 0 <= idx < len(routes):
+                routes[idx] = self.routes[idx][:]
+        new._cost_cache = self._cost_cache
+        return new
         
     def get_num_vehicles(self) -> int:
         """Get number of vehicles (routes) used"""
@@ -3,6 +3,7 @@
 Deep validation tool to verify solution feasibility
 """
 
+import logging
 from data_loader import Instance, Solution
 from local_search import LocalSearch
 import sys
@@ -169,6 +170,7 @@ def check_route_constraints(route, instance):
         print(f"  Node {node_id}: time={arrival_time}, load={load}, demand={node.dem}")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     if len(sys.argv) != 2:
         print("Usage: python deep_validation.py <instance_file>")
         sys.exit(1)
@@ -187,7 +189,7 @@ if __name__ == "__main__":
     ils = IteratedLocalSearch(instance, max_iterations=1, max_time=30)
     results = ils.solve()
     
-    if results and results.get('solution'):
-        validate_solution_thoroughly(instance_file, results['solution'])
+    if results and ils.best_solution:
+        validate_solution_thoroughly(instance_file, ils.best_solution)
     else:
         print("No solution found from ILS")
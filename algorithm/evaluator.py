@@ -6,12 +6,14 @@ Compares algorithm performance against benchmark solutions
 import os
 import time
 import json
-from typing import Dict, List, Tuple, Any
+import logging
+from typing import Dict, List, Tuple, Any, Optional
 from data_loader import Instance
 from solution_encoder import SolutionEncoder
 from construction_heuristic import GreedyInsertion, NearestNeighbor
-from local_search import LocalSearch
+from feasibility_validator import is_feasible
 
+log = logging.getLogger(__name__)
 
 class PDPTWBenchmarkEvaluator:
     """Evaluator for PDPTW algorithms against benchmark dataset"""
@@ -22,12 +24,8 @@ class PDPTWBenchmarkEvaluator:
         self.benchmark_solutions = self._load_benchmark_solutions()
         
     def _load_benchmark_solutions(self) -> Dict[str, Dict[str, Any]]:
-        """Load best known solutions from benchmark repository"""
-        benchmark = {
-            "n100": {}, "n200": {}, "n400": {}, "n600": {}, "n800": {},
-            "n1000": {}, "n1500": {}, "n2000": {}, "n2500": {}, "n3000": {},
-            "n4000": {}, "n5000": {}
-        }
+        """Load best known solutions from benchmark repository, keyed by instance name"""
+        benchmark = {}
         
         if os.path.exists(self.solutions_dir):
             for filename in os.listdir(self.solutions_dir):
@@ -43,10 +41,11 @@ class PDPTWBenchmarkEvaluator:
                             # Determine size category
                             size_category = self._get_size_category(instance_name)
                             if size_category:
-                                benchmark[size_category][instance_name] = {
+                                benchmark[instance_name] = {
                                     'vehicles': num_vehicles,
                                     'cost': cost,
-                                    'filename': filename
+                                    'filename': filename,
+                                    'size': size_category
                                 }
         
         return benchmark
@@ -60,7 +59,8 @@ class PDPTWBenchmarkEvaluator:
         return None
     
     def evaluate_algorithm(self, algorithm_class, algorithm_name: str, 
-                          instance_files: List[str], max_runtime: int = 300) -> Dict[str, Any]:
+                          instance_files: List[str], max_runtime: int = 300,
+                          instances: Optional[Dict[str, Instance]] = None) -> Dict[str, Any]:
         """
         Evaluate algorithm on given instance files
         
@@ -69,6 +69,8 @@ class PDPTWBenchmarkEvaluator:
             algorithm_name: Name of algorithm for reporting
             instance_files: List of instance file paths
             max_runtime: Maximum runtime per instance in seconds
+            instances: Optional already loaded instances keyed by file path,
+                       files missing from it are read from disk
         """
         results = {
             'algorithm': algorithm_name,
@@ -78,18 +80,21 @@ class PDPTWBenchmarkEvaluator:
             'instances': {}
         }
         
-        for instance_file in instance_files:
+        num_files = len(instance_files)
+        for file_idx, instance_file in enumerate(instance_files, 1):
             if not os.path.exists(instance_file):
-                print(f"Warning: Instance file {instance_file} not found")
+                log.warning("Instance file %s not found", instance_file)
                 continue
                 
             instance_name = os.path.basename(instance_file).replace('.txt', '')
-            print(f"Evaluating {algorithm_name} on {instance_name}...")
+            log.info("[%d/%d] Evaluating %s on %s...", file_idx, num_files, algorithm_name, instance_name)
             
             try:
-                # Load instance
-                instance = Instance()
-                instance.read_from_file(instance_file)
+                # Load instance (reuse a preloaded one when available)
+                instance = instances.get(instance_file) if instances else None
+                if instance is None:
+                    instance = Instance()
+                    instance.read_from_file(instance_file)
                 
                 # Run algorithm with timeout
                 start_time = time.time()
@@ -111,21 +116,23 @@ class PDPTWBenchmarkEvaluator:
                 cost = solution.get_cost(instance)
                 
                 # Get benchmark solution for comparison
-                size_category = self._get_size_category(instance_name)
+                benchmark_data = self.benchmark_solutions.get(instance_name)
                 benchmark_cost = None
                 benchmark_vehicles = None
                 
-                if size_category and instance_name in self.benchmark_solutions[size_category]:
-                    benchmark_data = self.benchmark_solutions[size_category][instance_name]
+                if benchmark_data:
                     benchmark_cost = benchmark_data['cost']
                     benchmark_vehicles = benchmark_data['vehicles']
                 
-                # Calculate gaps
-                cost_gap = None
+                # Calculate gaps (cost gap kept as integer numerator/denominator,
+                # the percentage is only computed when summarizing)
+                cost_num = None
+                cost_den = None
                 vehicle_gap = None
                 
                 if benchmark_cost:
-                    cost_gap = ((cost - benchmark_cost) / benchmark_cost) * 100
+                    cost_num = cost - benchmark_cost
+                    cost_den = benchmark_cost
                 if benchmark_vehicles:
                     vehicle_gap = num_vehicles - benchmark_vehicles
                 
@@ -136,25 +143,25 @@ class PDPTWBenchmarkEvaluator:
                     'runtime': runtime,
                     'benchmark_cost': benchmark_cost,
                     'benchmark_vehicles': benchmark_vehicles,
-                    'cost_gap_percent': cost_gap,
+                    'cost_num': cost_num,
+                    'cost_den': cost_den,
                     'vehicle_gap': vehicle_gap,
                     'timeout': runtime > max_runtime
                 }
                 
                 # Validate solution
-                validator = LocalSearch(instance)
-                is_valid = validator._is_valid_solution(solution)
+                is_valid = is_feasible(solution, instance)
                 results['instances'][instance_name]['valid'] = is_valid
                 
                 if not is_valid:
-                    print(f"  Warning: Invalid solution for {instance_name}")
+                    log.warning("  Invalid solution for %s", instance_name)
                 
-                print(f"  Cost: {cost}, Vehicles: {num_vehicles}, Runtime: {runtime:.2f}s")
-                if cost_gap is not None:
-                    print(f"  Gap: {cost_gap:.2f}%")
+                log.info("  Cost: %s, Vehicles: %d, Runtime: %.2fs", cost, num_vehicles, runtime)
+                if cost_den and log.isEnabledFor(logging.INFO):
+                    log.info("  Gap: %.2f%%", 100.0 * cost_num / cost_den)
                     
             except Exception as e:
-                print(f"Error evaluating {instance_name}: {str(e)}")
+                log.error("Error evaluating %s: %s", instance_name, e)
                 results['instances'][instance_name] = {
                     'error': str(e),
                     'solved': False
@@ -166,10 +173,10 @@ class PDPTWBenchmarkEvaluator:
                            if 'error' not in inst and inst['valid']]
             
             if valid_results:
-                results['avg_cost_gap'] = sum(
-                    inst.get('cost_gap_percent', 0) for inst in valid_results 
-                    if inst.get('cost_gap_percent') is not None
-                ) / len([inst for inst in valid_results if inst.get('cost_gap_percent') is not None])
+                cost_gaps = [100.0 * inst['cost_num'] / inst['cost_den']
+                             for inst in valid_results if inst.get('cost_den')]
+                if cost_gaps:
+                    results['avg_cost_gap'] = sum(cost_gaps) / len(cost_gaps)
                 
                 results['avg_vehicle_gap'] = sum(
                     inst.get('vehicle_gap', 0) for inst in valid_results 
@@ -195,9 +202,22 @@ class PDPTWBenchmarkEvaluator:
             'summary': {}
         }
         
+        # Parse every instance once and share it across all algorithms
+        instances = {}
+        for instance_file in instance_files:
+            if not os.path.exists(instance_file):
+                continue
+            try:
+                instance = Instance()
+                instance.read_from_file(instance_file)
+                instances[instance_file] = instance
+            except Exception as e:
+                log.error("Error loading %s: %s", instance_file, e)
+        
         for algorithm_name, algorithm_class in algorithm_configs:
-            print(f"\n=== Evaluating {algorithm_name} ===")
-            results = self.evaluate_algorithm(algorithm_class, algorithm_name, instance_files)
+            log.info("\n=== Evaluating %s ===", algorithm_name)
+            results = self.evaluate_algorithm(algorithm_class, algorithm_name, instance_files,
+                                              instances=instances)
             comparison_results['algorithms'][algorithm_name] = results
         
         # Create summary comparison
@@ -270,6 +290,7 @@ class PDPTWBenchmarkEvaluator:
 
 def run_benchmark_evaluation():
     """Run benchmark evaluation on sample instances"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     
     # Find available instance files (you need to download them first)
     instances_dir = "../instances"
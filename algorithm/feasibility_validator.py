@@ -5,7 +5,7 @@ Uses the official validator but adds detailed violation reporting
 
 import sys
 import os
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Iterable
 
 # Add parent directory to path to access validator
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -20,10 +20,14 @@ class FeasibilityValidator:
     def __init__(self, instance: Instance):
         self.instance = instance
         
-    def validate_solution(self, solution: Solution) -> Tuple[bool, List[str]]:
+    def validate_solution(self, solution: Solution, fast: bool = False) -> Tuple[bool, List[str]]:
         """
         Validate solution with detailed violation reporting
         
+        Args:
+            solution: Solution to validate
+            fast: Stop at the first violation instead of collecting all of them
+        
         Returns:
             (is_feasible, violations) where violations is a list of violation messages
         """
@@ -35,33 +39,78 @@ class FeasibilityValidator:
         
         for route_idx, route in enumerate(solution.routes):
             # Validate each route
-            route_violations = self._validate_route(route, route_idx, visited)
+            route_violations = self._validate_route(route, route_idx, visited, fast)
             if route_violations:
                 violations.extend(route_violations)
                 is_feasible = False
+                if fast:
+                    return False, violations
         
         # Check if all nodes are visited exactly once
-        missing_nodes = []
-        for i in range(1, self.instance.size):
-            if visited[i] == 0:
-                missing_nodes.append(i)
-            elif visited[i] > 1:
-                violations.append(f"Node {i} visited {visited[i]} times (duplicate)")
-                is_feasible = False
-        
-        if missing_nodes:
-            violations.append(f"Nodes not visited: {missing_nodes}")
+        # min/max scan the counts in C, so the common case needs no Python loop
+        counts = visited[1:]
+        if counts and (min(counts) != 1 or max(counts) != 1):
             is_feasible = False
+            for i, count in enumerate(counts, 1):
+                if count > 1:
+                    violations.append(f"Node {i} visited {count} times (duplicate)")
+                    if fast:
+                        return False, violations
+            
+            missing_nodes = [i for i, count in enumerate(counts, 1) if count == 0]
+            if missing_nodes:
+                violations.append(f"Nodes not visited: {missing_nodes}")
         
         return is_feasible, violations
     
-    def _validate_route(self, route: List[int], route_idx: int, visited: List[int]) -> List[str]:
-        """Validate a single route and return list of violations"""
+    def is_feasible(self, solution: Solution) -> bool:
+        """Boolean feasibility check that stops at the first violation"""
+        feasible, _ = self.validate_solution(solution, fast=True)
+        return feasible
+    
+    def validate_routes(self, solution: Solution, only: Iterable[int],
+                        fast: bool = False) -> Tuple[bool, List[str]]:
+        """
+        Validate only the routes at the given indices
+        
+        For callers that edited a few routes of an otherwise feasible
+        solution. Duplicates are only detected among the checked routes and
+        node coverage is not checked, the caller must guarantee both.
+        
+        Returns:
+            (is_feasible, violations) for the checked routes
+        """
+        violations = []
+        visited = [0] * self.instance.size
+        
+        for route_idx in only:
+            route_violations = self._validate_route(solution.routes[route_idx], route_idx, visited, fast)
+            if route_violations:
+                violations.extend(route_violations)
+                if fast:
+                    break
+        
+        return not violations, violations
+    
+    def _validate_route(self, route: List[int], route_idx: int, visited: List[int],
+                        fast: bool = False) -> List[str]:
+        """
+        Validate a single route and return list of violations
+        
+        With fast=True the first violation found is returned immediately.
+        """
         violations = []
         
         if not route:
             return violations
         
+        # Bind instance data to locals once; this loop runs for every node of
+        # every route, so attribute and method lookups dominate its cost
+        nodes = self.instance.nodes
+        times = self.instance.times
+        size = self.instance.size
+        capacity = self.instance.capacity
+        
         time = 0
         load = 0
         prev_node = 0  # depot
@@ -69,20 +118,23 @@ class FeasibilityValidator:
         
         for pos, node_id in enumerate(route):
             # Check node bounds
-            if node_id < 0 or node_id >= self.instance.size:
+            if node_id < 0 or node_id >= size:
                 violations.append(f"Route {route_idx}: Invalid node ID {node_id} at position {pos}")
+                if fast:
+                    return violations
                 continue
             
             # Check duplicate visits
             if visited[node_id] > 0:
                 violations.append(f"Route {route_idx}: Node {node_id} already visited")
+                if fast:
+                    return violations
             visited[node_id] += 1
             
-            node = self.instance.nodes[node_id]
+            node = nodes[node_id]
             
-            # Update time
-            travel_time = self.instance.get_travel_time(prev_node, node_id)
-            time += travel_time
+            # Update time (both indices are bounds-checked above)
+            time += times[prev_node][node_id]
             
             # Check time window
             arrival_time = max(time, node.etw)
@@ -91,29 +143,37 @@ class FeasibilityValidator:
                     f"Route {route_idx}: Time window violation at node {node_id} "
                     f"(arrival {arrival_time} > latest {node.ltw})"
                 )
+                if fast:
+                    return violations
             
             # Check pickup-delivery precedence
-            if node.is_delivery():
+            if node.dem < 0:
                 pickup_idx = node.pair
                 if pickup_idx not in visited_pickups_in_route:
                     violations.append(
                         f"Route {route_idx}: Delivery {node_id} before pickup {pickup_idx}"
                     )
+                    if fast:
+                        return violations
             
             # Update load and check capacity
             load += node.dem
-            if load > self.instance.capacity:
+            if load > capacity:
                 violations.append(
                     f"Route {route_idx}: Capacity exceeded at node {node_id} "
-                    f"(load {load} > capacity {self.instance.capacity})"
+                    f"(load {load} > capacity {capacity})"
                 )
+                if fast:
+                    return violations
             if load < 0:
                 violations.append(
                     f"Route {route_idx}: Negative load {load} at node {node_id}"
                 )
+                if fast:
+                    return violations
             
             # Mark pickup as visited
-            if node.is_pickup():
+            if node.dem > 0:
                 visited_pickups_in_route.add(node_id)
             
             # Update time after service
@@ -122,8 +182,8 @@ class FeasibilityValidator:
         
         # Check return to depot
         if route:
-            return_time = time + self.instance.get_travel_time(prev_node, 0)
-            depot = self.instance.nodes[0]
+            return_time = time + times[prev_node][0]
+            depot = nodes[0]
             if return_time > depot.ltw:
                 violations.append(
                     f"Route {route_idx}: Return to depot too late "
@@ -140,30 +200,19 @@ class FeasibilityValidator:
             (is_valid, message, num_vehicles, cost)
         """
         try:
-            # Create a mock instance object with the required format
-            class MockInstance:
-                def __init__(self, real_instance):
-                    self.size = real_instance.size
-                    self.capacity = real_instance.capacity
-                    self.nodes = real_instance.nodes
-                    self.times = real_instance.times
-            
-            mock_inst = MockInstance(self.instance)
+            # The official validator only reads size, capacity, nodes and times,
+            # all of which Instance already exposes, so it is passed directly
             
             # Ensure routes include depot wrapping
             wrapped_solution = Solution()
             wrapped_solution.inst_name = solution.inst_name
             wrapped_solution.authors = solution.authors
-            wrapped_solution.routes = []
-            
-            for route in solution.routes:
-                if route and route[0] != 0:
-                    wrapped_route = [0] + route + [0]
-                else:
-                    wrapped_route = route
-                wrapped_solution.routes.append(wrapped_route)
+            wrapped_solution.routes = [
+                [0, *route, 0] if route and route[0] != 0 else route
+                for route in solution.routes
+            ]
             
-            result = official_validate_solution(mock_inst, wrapped_solution)
+            result = official_validate_solution(self.instance, wrapped_solution)
             return result
             
         except Exception as e:
@@ -179,3 +228,14 @@ def validate_solution(solution: Solution, instance: Instance) -> Tuple[bool, Lis
     """
     validator = FeasibilityValidator(instance)
     return validator.validate_solution(solution)
+
+
+def is_feasible(solution: Solution, instance: Instance) -> bool:
+    """
+    Convenience function for boolean feasibility checks in hot loops
+    
+    Returns:
+        True if the solution has no violations
+    """
+    validator = FeasibilityValidator(instance)
+    return validator.is_feasible(solution)
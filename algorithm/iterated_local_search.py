@@ -10,6 +10,12 @@ Implements the research framework with:
 import random
 import time
 import copy
+import csv
+import logging
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import accumulate
 from typing import List, Dict, Tuple, Optional
 from data_loader import Instance, Solution
 from solution_encoder import SolutionEncoder
@@ -18,9 +24,47 @@ from clarke_wright_pdptw import ClarkeWrightPDPTW
 from route_elimination import RouteElimination
 from large_neighborhood_search import LargeNeighborhoodSearch
 from local_search import LocalSearch
-from feasibility_validator import validate_solution
+from feasibility_validator import FeasibilityValidator
 from route_improvement import RouteImprovement
 
+log = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _load_best_known_solutions() -> Dict:
+    """Load best known solutions from bks.dat, parsed once per process"""
+    try:
+        with open('../solutions/bks.dat', 'r', newline='') as f:
+            reader = csv.reader(f, delimiter=';')
+            next(reader, None)  # Skip header
+            return {row[0]: {'vehicles': int(row[2]), 'cost': int(row[3])}
+                    for row in reader if len(row) >= 4}
+    except FileNotFoundError:
+        log.warning("Warning: Best known solutions file not found")
+        return {}
+
+
+def _route_time_feasible(route: List[int], times, etw: List[int], ltw: List[int],
+                         dur: List[int]) -> bool:
+    """
+    Time-window forward pass over flat per-node lists
+    
+    Returns False at the first node reached after its latest start time or
+    if the vehicle gets back to the depot after it closes.
+    """
+    time = 0
+    prev_node = 0
+    for node_id in route:
+        time += times[prev_node][node_id]
+        if time < etw[node_id]:
+            time = etw[node_id]
+        if time > ltw[node_id]:
+            return False
+        time += dur[node_id]
+        prev_node = node_id
+    
+    return time + times[prev_node][0] <= ltw[0]
+
 
 class AGES:
 # Trong file thuật toán chính của bạn (ví dụ: iterated_local_search.py)
@@ -34,18 +78,23 @@ class AGES:
         # Sắp xếp request để dễ chèn hơn (ví dụ: theo thời gian sớm nhất e_i)
         unassigned_requests.sort(key=lambda x: self.instance.nodes[x[0]].early_time)
         
+        # Đánh dấu request còn chờ thay vì xóa khỏi danh sách (tránh O(R^2))
+        alive = [True] * len(unassigned_requests)
+        remaining = len(unassigned_requests)
+        
         routes = []
         
-        while unassigned_requests:
+        while remaining:
             # Bắt đầu một xe mới (Route mới)
             current_route = [0, 0] # [Depot Start, ..., Depot End]
             route_load = 0
             route_time = 0
             
-            # Biến lưu các request đã chèn được vào xe này
-            inserted_in_this_route = []
+            remaining_before = remaining
             
-            for req in unassigned_requests[:]: # Duyệt copy của danh sách
+            for idx, req in enumerate(unassigned_requests):
+                if not alive[idx]:
+                    continue
                 pickup_node = req[0]
                 delivery_node = req[1]
                 
@@ -56,17 +105,16 @@ class AGES:
                 if best_pos is not None:
                     # Thực hiện chèn
                     self.apply_insertion(current_route, pickup_node, delivery_node, best_pos)
-                    inserted_in_this_route.append(req)
+                    alive[idx] = False
+                    remaining -= 1
             
             # Nếu tạo xe mới mà không nhét được ai -> Bế tắc (Lỗi dữ liệu hoặc logic chèn quá kém)
-            if not inserted_in_this_route:
-                print("CRITICAL: Cannot insert remaining requests even with empty vehicle!")
+            if remaining == remaining_before:
+                log.error("CRITICAL: Cannot insert remaining requests even with empty vehicle!")
                 return None 
 
-            # Lưu lộ trình này và xóa các request đã phục vụ khỏi danh sách chờ
+            # Lưu lộ trình này
             routes.append(current_route)
-            for req in inserted_in_this_route:
-                unassigned_requests.remove(req)
                 
         return routes
     
@@ -74,13 +122,35 @@ class AGES:
     
     def __init__(self, instance: Instance):
         self.instance = instance
+        
+        # Per-node data as flat lists for the merge screening hot loop
+        self._dem = [node.dem for node in instance.nodes]
+        self._etw = [node.etw for node in instance.nodes]
+        self._ltw = [node.ltw for node in instance.nodes]
+        self._dur = [node.dur for node in instance.nodes]
+        self._pair = [node.pair for node in instance.nodes]
+        
+        # Node coordinates: Li & Lim instances fill x/y, Sartori & Buriol lat/long
+        if any(node.x or node.y for node in instance.nodes):
+            self._coords = [(node.x, node.y) for node in instance.nodes]
+        else:
+            self._coords = [(node.lat, node.long) for node in instance.nodes]
+        
+        # One validator for all feasibility checks
+        self._validator = LocalSearch(instance)
+        
+        # Route tuple -> (departure from last node, latest start at first node)
+        self._summary_cache = {}
+        
+        # Route tuple pairs known not to merge in either order
+        self._failed_merges = set()
     
     def reduce_vehicles(self, solution: Solution, max_iterations: int = 100) -> Solution:
         """
         Attempt to reduce number of vehicles while maintaining feasibility
         AGGRESSIVE: Try harder to merge routes
         """
-        print(f"AGES: Starting vehicle reduction from {solution.get_num_vehicles()} vehicles")
+        log.info("AGES: Starting vehicle reduction from %s vehicles", solution.get_num_vehicles())
         
         best_solution = self._copy_solution(solution)
         current_vehicles = solution.get_num_vehicles()
@@ -102,15 +172,19 @@ class AGES:
                 if self._is_feasible(merged_solution):
                     solution = merged_solution
                     current_vehicles = solution.get_num_vehicles()
-                    print(f"AGES: Reduced to {current_vehicles} vehicles (iteration {iteration+1})")
+                    log.debug("AGES: Reduced to %s vehicles (iteration %s)", current_vehicles, iteration+1)
                     best_solution = self._copy_solution(solution)
                     attempts_without_improvement = 0
                 else:
                     attempts_without_improvement += 1
             else:
                 attempts_without_improvement += 1
+                # Solution unchanged: once every pair is a known failure the
+                # remaining attempts cannot merge anything
+                if self._all_merges_failed(solution):
+                    break
                 
-        print(f"AGES: Final vehicles: {best_solution.get_num_vehicles()}")
+        log.info("AGES: Final vehicles: %s", best_solution.get_num_vehicles())
         return best_solution
     
     def _try_merge_routes(self, solution: Solution) -> Optional[Solution]:
@@ -118,6 +192,11 @@ class AGES:
         if len(solution.routes) < 2:
             return None
             
+        # Summaries and keys once for all O(k^2) pairs; each pair is then an
+        # O(1) screen unless it passes or has not failed before
+        summaries = [self._route_summary(route) if route else None for route in solution.routes]
+        keys = [tuple(route) for route in solution.routes]
+        
         # Find two smallest routes to merge
         route_sizes = [(i, len(route)) for i, route in enumerate(solution.routes)]
         route_sizes.sort(key=lambda x: x[1])
@@ -127,7 +206,7 @@ class AGES:
                 route1_idx = route_sizes[i][0]
                 route2_idx = route_sizes[j][0]
                 
-                merged = self._merge_two_routes(solution, route1_idx, route2_idx)
+                merged = self._try_merge_pair(solution, route1_idx, route2_idx, summaries, keys)
                 if merged:
                     return merged
         
@@ -141,75 +220,246 @@ class AGES:
         if len(solution.routes) < 2:
             return None
         
-        # Strategy 1: Try smallest routes first
-        route_sizes = [(i, len(route)) for i, route in enumerate(solution.routes)]
-        route_sizes.sort(key=lambda x: x[1])
+        # Summaries of every route once for this call, so each candidate
+        # pair is screened by index instead of re-hashing the route
+        summaries = [self._route_summary(route) if route else None for route in solution.routes]
+        keys = [tuple(route) for route in solution.routes]
         
-        # Try top 5 smallest combinations
-        attempts = 0
-        for i in range(min(5, len(route_sizes) - 1)):
-            for j in range(i + 1, min(i + 5, len(route_sizes))):
-                route1_idx = route_sizes[i][0]
-                route2_idx = route_sizes[j][0]
-                
-                merged = self._merge_two_routes(solution, route1_idx, route2_idx)
-                if merged:
-                    return merged
-                
-                attempts += 1
-                if attempts > 10:
-                    break
-            if attempts > 10:
-                break
+        # Strategy 1: Try nearby routes only, smallest routes first
+        for route1_idx, route2_idx in self._nearest_route_pairs(solution):
+            merged = self._try_merge_pair(solution, route1_idx, route2_idx, summaries, keys)
+            if merged:
+                return merged
         
-        # Strategy 2: Try random pairs if smallest didn't work
+        # Strategy 2: Try random pairs if no nearby pair merged
         import random
         for _ in range(5):
             if len(solution.routes) < 2:
                 break
-            i, j = random.sample(range(len(solution.routes)), 2)
-            merged = self._merge_two_routes(solution, i, j)
+            # Two distinct indices without materializing the range
+            i = random.randrange(len(solution.routes))
+            j = random.randrange(len(solution.routes) - 1)
+            if j >= i:
+                j += 1
+            merged = self._try_merge_pair(solution, i, j, summaries, keys)
             if merged:
                 return merged
         
         return None
     
-    def _merge_two_routes(self, solution: Solution, route1_idx: int, route2_idx: int) -> Optional[Solution]:
-        """Merge two specific routes"""
-        new_solution = self._copy_solution(solution)
+    def _try_merge_pair(self, solution: Solution, route1_idx: int, route2_idx: int,
+                        summaries: List[Tuple[float, float]], keys: List[tuple]) -> Optional[Solution]:
+        """
+        _merge_two_routes, skipping route pairs that already failed to merge
         
-        route1 = new_solution.routes[route1_idx]
-        route2 = new_solution.routes[route2_idx]
+        Failures are remembered by route contents, so they carry over across
+        AGES iterations and ILS iterations until one of the routes changes.
+        Pairs that fail the O(1) time screen in both orders are dropped first,
+        before hashing the two route tuples for the memo.
+        """
+        route1 = solution.routes[route1_idx]
+        route2 = solution.routes[route2_idx]
+        if not (self._concat_may_fit(route1, route2, summaries[route1_idx], summaries[route2_idx]) or
+                self._concat_may_fit(route2, route1, summaries[route2_idx], summaries[route1_idx])):
+            return None
         
-        # Try different merge strategies
-        merge_strategies = [
-            route1 + route2,  # Concatenate
-            route2 + route1,  # Reverse concatenate
-        ]
+        pair_key = frozenset((keys[route1_idx], keys[route2_idx]))
+        if pair_key in self._failed_merges:
+            return None
         
-        for merged_route in merge_strategies:
-            test_solution = self._copy_solution(new_solution)
+        merged = self._merge_two_routes(solution, route1_idx, route2_idx, summaries)
+        if merged is None:
+            if len(self._failed_merges) >= 100000:
+                self._failed_merges.clear()
+            self._failed_merges.add(pair_key)
+        return merged
+    
+    def _all_merges_failed(self, solution: Solution) -> bool:
+        """True if every route pair fails the time screen or already failed to merge"""
+        routes = solution.routes
+        summaries = [self._route_summary(route) if route else None for route in routes]
+        keys = [tuple(route) for route in routes]
+        failed = self._failed_merges
+        
+        for i in range(len(routes) - 1):
+            for j in range(i + 1, len(routes)):
+                if (not (self._concat_may_fit(routes[i], routes[j], summaries[i], summaries[j]) or
+                         self._concat_may_fit(routes[j], routes[i], summaries[j], summaries[i])) or
+                        frozenset((keys[i], keys[j])) in failed):
+                    continue
+                return False
+        return True
+    
+    def _nearest_route_pairs(self, solution: Solution, k: int = 5) -> List[Tuple[int, int]]:
+        """
+        Candidate merge pairs: each route with its k nearest routes by centroid
+        
+        Routes whose centroids are far apart almost never merge feasibly, so
+        they are not tried. Routes are visited smallest first.
+        """
+        coords = self._coords
+        centroids = {}
+        for idx, route in enumerate(solution.routes):
+            if route:
+                centroids[idx] = (sum(coords[n][0] for n in route) / len(route),
+                                  sum(coords[n][1] for n in route) / len(route))
+        
+        pairs = []
+        seen = set()
+        for idx in sorted(centroids, key=lambda i: len(solution.routes[i])):
+            cx, cy = centroids[idx]
+            nearest = sorted((other for other in centroids if other != idx),
+                             key=lambda o: (centroids[o][0] - cx) ** 2 + (centroids[o][1] - cy) ** 2)
+            for other in nearest[:k]:
+                key = (min(idx, other), max(idx, other))
+                if key not in seen:
+                    seen.add(key)
+                    pairs.append((idx, other))
+        
+        return pairs
+    
+    def _merge_two_routes(self, solution: Solution, route1_idx: int, route2_idx: int,
+                          summaries: Optional[List[Tuple[float, float]]] = None) -> Optional[Solution]:
+        """
+        Merge two specific routes
+        
+        Candidates share all untouched route lists with the input solution,
+        only the merged route is newly built. Since the other routes and the
+        set of visited nodes are unchanged, only the merged route is checked.
+        
+        Each concatenation is first screened in O(1) from cached route
+        summaries: the vehicle must leave the first route in time to start
+        the second one no later than its latest feasible start. Callers that
+        try many pairs pass the summaries of all routes, indexed like routes.
+        """
+        route1 = solution.routes[route1_idx]
+        route2 = solution.routes[route2_idx]
+        if summaries is None:
+            summaries = {idx: self._route_summary(solution.routes[idx]) if solution.routes[idx] else None
+                         for idx in (route1_idx, route2_idx)}
+        
+        # Try different merge strategies: concatenate, reverse concatenate
+        for first_idx, second_idx in ((route1_idx, route2_idx), (route2_idx, route1_idx)):
+            first = solution.routes[first_idx]
+            second = solution.routes[second_idx]
+            if not self._concat_may_fit(first, second, summaries[first_idx], summaries[second_idx]):
+                continue
+            
+            merged_route = first + second
+            if not self._is_route_feasible_fast(merged_route):
+                continue
+            
+            test_solution = self._share_solution(solution)
             test_solution.routes[route1_idx] = merged_route
             test_solution.routes.pop(route2_idx)
-            
-            if self._is_feasible(test_solution):
-                return test_solution
+            return test_solution
         
         return None
     
+    def _concat_may_fit(self, first: List[int], second: List[int],
+                        first_summary: Optional[Tuple[float, float]],
+                        second_summary: Optional[Tuple[float, float]]) -> bool:
+        """
+        O(1) time screen for first + second from the two route summaries
+        
+        The vehicle must leave the first route in time to start the second
+        one no later than its latest feasible start. Always True if either
+        route is empty.
+        """
+        if not first or not second:
+            return True
+        departure = first_summary[0]
+        latest_start = second_summary[1]
+        arrival = departure + self.instance.times[first[-1]][second[0]]
+        return max(arrival, self._etw[second[0]]) <= latest_start
+    
+    def _route_summary(self, route: List[int]) -> Tuple[float, float]:
+        """
+        Cached (departure from the last node, latest start at the first node)
+        
+        The departure comes from a forward pass starting at the depot and is
+        infinite if the route itself breaks a time window. The latest start
+        comes from a backward pass from the depot closing time.
+        """
+        key = tuple(route)
+        summary = self._summary_cache.get(key)
+        if summary is not None:
+            return summary
+        
+        times = self.instance.times
+        etw, ltw, dur = self._etw, self._ltw, self._dur
+        
+        departure = 0
+        prev_node = 0
+        for node_id in route:
+            departure += times[prev_node][node_id]
+            if departure < etw[node_id]:
+                departure = etw[node_id]
+            if departure > ltw[node_id]:
+                departure = float('inf')
+                break
+            departure += dur[node_id]
+            prev_node = node_id
+        
+        latest_start = ltw[0]
+        next_node = 0
+        for node_id in reversed(route):
+            latest_start = min(ltw[node_id], latest_start - times[node_id][next_node] - dur[node_id])
+            next_node = node_id
+        
+        if len(self._summary_cache) >= 100000:
+            self._summary_cache.clear()
+        summary = (departure, latest_start)
+        self._summary_cache[key] = summary
+        return summary
+    
+    def _is_route_feasible_fast(self, route: List[int]) -> bool:
+        """
+        Cheap single-route check used to screen merge candidates
+        
+        Rules out most candidates before any time arithmetic: capacity via a
+        prefix sum of demands, then pickup-before-delivery via a position map,
+        and only then the time-window forward pass with early exit.
+        """
+        if not route:
+            return True
+        
+        dem = self._dem
+        
+        # Capacity: prefix sum of demands must stay within [0, capacity]
+        loads = list(accumulate(dem[node_id] for node_id in route))
+        if max(loads) > self.instance.capacity or min(loads) < 0:
+            return False
+        
+        # Pairing: every delivery must come after its pickup
+        pair = self._pair
+        position = {node_id: pos for pos, node_id in enumerate(route)}
+        for pos, node_id in enumerate(route):
+            if dem[node_id] < 0 and position.get(pair[node_id], pos) >= pos:
+                return False
+        
+        # Time windows: forward pass, stop at the first violation
+        return _route_time_feasible(route, self.instance.times,
+                                    self._etw, self._ltw, self._dur)
+    
     def _is_feasible(self, solution: Solution) -> bool:
         """Check if solution is feasible"""
-        validator = LocalSearch(self.instance)
-        return validator._is_valid_solution(solution)
+        return self._validator._is_valid_solution(solution)
     
     def _copy_solution(self, solution: Solution) -> Solution:
         """Deep copy solution"""
+        return solution.clone()
+    
+    def _share_solution(self, solution: Solution) -> Solution:
+        """Shallow copy solution: new routes list, route lists shared by reference"""
         copy_sol = Solution()
         copy_sol.inst_name = solution.inst_name
         copy_sol.authors = solution.authors
         copy_sol.date = solution.date
         copy_sol.reference = solution.reference
-        copy_sol.routes = [route[:] for route in solution.routes]
+        copy_sol.routes = list(solution.routes)
+        # Per-route costs carry over; get_cost re-sums only replaced routes
+        copy_sol._cost_cache = solution._cost_cache
         return copy_sol
 
 
@@ -218,33 +468,55 @@ class SetPartitioning:
     
     def __init__(self, instance: Instance):
         self.instance = instance
+        
+        # Route tuple -> route cost, shared by every solution SP has scored;
+        # pool members mostly descend from each other and share routes
+        self._route_costs = {}
     
     def select_best_combination(self, solutions: List[Solution]) -> Solution:
         """Select best combination from multiple solutions"""
         if not solutions:
             return None
             
-        print(f"SP: Evaluating {len(solutions)} solutions")
+        log.debug("SP: Evaluating %s solutions", len(solutions))
         
         best_solution = None
         best_score = float('inf')
+        best_vehicles = best_cost = None
         
+        debug = log.isEnabledFor(logging.DEBUG)
         for i, solution in enumerate(solutions):
             # Multi-criteria scoring: vehicles + cost
             vehicles = solution.get_num_vehicles()
-            cost = solution.get_cost(self.instance)
+            cost = self._solution_cost(solution)
             
             # Weighted score: prioritize fewer vehicles first, then cost
             score = vehicles * 10000 + cost
             
-            print(f"SP: Solution {i+1}: {vehicles} vehicles, cost {cost}, score {score}")
+            if debug:
+                log.debug("SP: Solution %s: %s vehicles, cost %s, score %s", i+1, vehicles, cost, score)
             
             if score < best_score:
                 best_score = score
                 best_solution = solution
+                best_vehicles, best_cost = vehicles, cost
         
-        print(f"SP: Selected solution with {best_solution.get_num_vehicles()} vehicles, cost {best_solution.get_cost(self.instance)}")
+        log.info("SP: Selected solution with %s vehicles, cost %s", best_vehicles, best_cost)
         return best_solution
+    
+    def _solution_cost(self, solution: Solution) -> int:
+        """Solution.get_cost through the shared per-route cost memo"""
+        route_costs = self._route_costs
+        if len(route_costs) >= 100000:
+            route_costs.clear()
+        
+        cost = 0
+        for route in map(tuple, solution.routes):
+            route_cost = route_costs.get(route)
+            if route_cost is None:
+                route_cost = route_costs[route] = Solution._route_cost(route, self.instance)
+            cost += route_cost
+        return cost
 
 
 class Perturbation:
@@ -252,6 +524,7 @@ class Perturbation:
     
     def __init__(self, instance: Instance):
         self.instance = instance
+        self._validator = FeasibilityValidator(instance)
     
     def perturb_solution(self, solution: Solution, intensity: int = 2) -> Solution:
         """
@@ -259,35 +532,43 @@ class Perturbation:
         
         CRITICAL: Perturbation must preserve feasibility!
         If perturbation creates infeasible solution, revert to original.
+        
+        The perturbed solution shares untouched route lists with the input;
+        the perturbation operators replace the routes they modify instead of
+        editing them in place, so the input itself is never changed.
+        
+        The input must be feasible: each step validates only the routes it
+        replaced, plus a node count check for pairs that were dropped.
         """
-        print(f"Perturbation: Applying intensity {intensity}")
+        log.debug("Perturbation: Applying intensity %s", intensity)
+        
+        original = solution
+        perturbed = self._share_solution(solution)
+        original_size = sum(map(len, original.routes))
         
-        original = self._copy_solution(solution)
-        perturbed = self._copy_solution(solution)
+        # Ids of route lists known to be feasible: the input's own lists and
+        # every list validated by an earlier step. Holding the lists in
+        # checked_routes keeps their ids from being reused.
+        checked = {id(route) for route in original.routes}
+        checked_routes = []
         
         for i in range(intensity):
-            # Choose random perturbation type
-            perturbation_type = random.choice([
-                'relocate_customers',
-                'swap_routes'
-            ])
-            
-            if perturbation_type == 'relocate_customers':
+            # Choose random perturbation type: relocate customers or swap routes
+            if random.random() < 0.5:
                 perturbed = self._relocate_random_customers(perturbed, 1)
-            elif perturbation_type == 'swap_routes':
+            else:
                 perturbed = self._swap_route_segments(perturbed)
             
-            # Validate after each perturbation step
-            is_feasible, violations = validate_solution(perturbed, self.instance)
-            if not is_feasible:
-                print(f"  Perturbation step {i+1} created infeasibility, reverting...")
+            # Validate after each perturbation step, only the routes this
+            # step replaced; everything else was already checked
+            changed = [idx for idx, route in enumerate(perturbed.routes) if id(route) not in checked]
+            if (sum(map(len, perturbed.routes)) != original_size or
+                    not self._validator.validate_routes(perturbed, changed, fast=True)[0]):
+                log.debug("  Perturbation step %s created infeasibility, reverting...", i+1)
                 return original  # Revert to original feasible solution
-        
-        # Final validation
-        is_final_feasible, _ = validate_solution(perturbed, self.instance)
-        if not is_final_feasible:
-            print(f"  Perturbation failed feasibility check, returning original...")
-            return original
+            for idx in changed:
+                checked.add(id(perturbed.routes[idx]))
+                checked_routes.append(perturbed.routes[idx])
         
         return perturbed
     
@@ -299,47 +580,69 @@ class Perturbation:
         if not solution.routes:
             return solution
             
-        # Collect all pickup-delivery pairs in solution
-        pairs_in_solution = []
-        for route_idx, route in enumerate(solution.routes):
-            visited = set()
-            for node_id in route:
-                if node_id not in visited:
-                    node = self.instance.nodes[node_id]
-                    if node.is_pickup() and node.pair in route:
-                        pairs_in_solution.append(((node_id, node.pair), route_idx))
-                        visited.add(node_id)
-                        visited.add(node.pair)
-        
-        if len(pairs_in_solution) < num_pairs:
+        # Select random pairs to relocate
+        pairs_to_move = self._sample_pairs(solution, num_pairs)
+        if len(pairs_to_move) < num_pairs:
             return solution
         
-        # Select random pairs to relocate
-        pairs_to_move = random.sample(pairs_in_solution, num_pairs)
+        # Drop every moved pair from its old route in one pass per route
+        dropped_by_route = {}
+        for (pickup, delivery), old_route_idx in pairs_to_move:
+            dropped_by_route.setdefault(old_route_idx, set()).update((pickup, delivery))
+        for old_route_idx, to_drop in dropped_by_route.items():
+            solution.routes[old_route_idx] = [n for n in solution.routes[old_route_idx] if n not in to_drop]
         
         for (pickup, delivery), old_route_idx in pairs_to_move:
-            # Remove BOTH pickup and delivery from old route
-            if pickup in solution.routes[old_route_idx]:
-                solution.routes[old_route_idx].remove(pickup)
-            if delivery in solution.routes[old_route_idx]:
-                solution.routes[old_route_idx].remove(delivery)
-            
             # Add pair to a different random route
             if len(solution.routes) > 1:
-                available_routes = [i for i in range(len(solution.routes)) if i != old_route_idx and solution.routes[i]]
-                if available_routes:
-                    new_route_idx = random.choice(available_routes)
-                    # Insert pickup first, then delivery after
-                    pickup_pos = random.randint(0, len(solution.routes[new_route_idx]))
-                    solution.routes[new_route_idx].insert(pickup_pos, pickup)
-                    delivery_pos = random.randint(pickup_pos + 1, len(solution.routes[new_route_idx]) + 1)
-                    solution.routes[new_route_idx].insert(delivery_pos, delivery)
+                new_route_idx = self._probe_route(solution, 1, old_route_idx)
+                if new_route_idx is not None:
+                    route = solution.routes[new_route_idx]
+                    # Pickup first, then delivery after it, spliced into a new list
+                    pickup_pos = random.randint(0, len(route))
+                    delivery_pos = random.randint(pickup_pos + 1, len(route) + 1)
+                    solution.routes[new_route_idx] = (route[:pickup_pos] + [pickup] +
+                                                      route[pickup_pos:delivery_pos - 1] + [delivery] +
+                                                      route[delivery_pos - 1:])
         
         # Remove empty routes
         solution.routes = [route for route in solution.routes if route]
         
         return solution
     
+    def _sample_pairs(self, solution: Solution, num_pairs: int) -> List[Tuple[Tuple[int, int], int]]:
+        """
+        Draw up to num_pairs distinct ((pickup, delivery), route_idx) pairs
+        
+        Draws random node positions and maps each to its pair, instead of
+        listing every pair in the solution. In a feasible solution every
+        pair shares a route, so each pair is equally likely. Pairs split over
+        two routes are skipped; fewer than num_pairs are returned if the
+        draws run out.
+        """
+        routes = solution.routes
+        ends = list(accumulate(map(len, routes)))
+        total = ends[-1] if ends else 0
+        if total == 0:
+            return []
+        
+        nodes = self.instance.nodes
+        sampled = {}
+        for _ in range(4 * num_pairs + 8):
+            pos = random.randrange(total)
+            route_idx = bisect_right(ends, pos)
+            node_id = routes[route_idx][pos - (ends[route_idx - 1] if route_idx else 0)]
+            node = nodes[node_id]
+            if node.dem == 0:
+                continue
+            pickup, delivery = (node_id, node.pair) if node.dem > 0 else (node.pair, node_id)
+            if pickup not in sampled and node.pair in routes[route_idx]:
+                sampled[pickup] = ((pickup, delivery), route_idx)
+                if len(sampled) == num_pairs:
+                    break
+        
+        return list(sampled.values())
+    
     def _swap_route_segments(self, solution: Solution) -> Solution:
         """
         Swap small segments between two routes
@@ -349,11 +652,13 @@ class Perturbation:
             return solution
             
         # Select two random routes with customers
-        routes_with_customers = [i for i, r in enumerate(solution.routes) if len(r) >= 2]
-        if len(routes_with_customers) < 2:
+        route1_idx = self._probe_route(solution, 2)
+        if route1_idx is None:
+            return solution
+        route2_idx = self._probe_route(solution, 2, route1_idx)
+        if route2_idx is None:
             return solution
         
-        route1_idx, route2_idx = random.sample(routes_with_customers, 2)
         route1 = solution.routes[route1_idx]
         route2 = solution.routes[route2_idx]
         
@@ -373,23 +678,46 @@ class Perturbation:
         seg1 = route1[seg1_start:seg1_end]
         seg2 = route2[seg2_start:seg2_end]
         
-        # Swap segments
-        new_route1 = route1[:seg1_start] + seg2 + route1[seg1_end:]
-        new_route2 = route2[:seg2_start] + seg1 + route2[seg2_end:]
+        # Swap segments: one copy per route, then splice the other segment
+        # in place instead of concatenating three slices
+        new_route1 = route1[:]
+        new_route1[seg1_start:seg1_end] = seg2
+        new_route2 = route2[:]
+        new_route2[seg2_start:seg2_end] = seg1
         
         solution.routes[route1_idx] = new_route1
         solution.routes[route2_idx] = new_route2
         
         return solution
     
-    def _copy_solution(self, solution: Solution) -> Solution:
-        """Deep copy solution"""
+    def _probe_route(self, solution: Solution, min_len: int, exclude: int = -1) -> Optional[int]:
+        """
+        Random route index with at least min_len nodes, other than exclude
+        
+        Starts at a random index and probes forward, so no candidate list is
+        built. Returns None if no route qualifies.
+        """
+        routes = solution.routes
+        num_routes = len(routes)
+        if not num_routes:
+            return None
+        start = random.randrange(num_routes)
+        for step in range(num_routes):
+            idx = (start + step) % num_routes
+            if idx != exclude and len(routes[idx]) >= min_len:
+                return idx
+        return None
+    
+    def _share_solution(self, solution: Solution) -> Solution:
+        """Shallow copy solution: new routes list, route lists shared by reference"""
         copy_sol = Solution()
         copy_sol.inst_name = solution.inst_name
         copy_sol.authors = solution.authors
         copy_sol.date = solution.date
         copy_sol.reference = solution.reference
-        copy_sol.routes = [route[:] for route in solution.routes]
+        copy_sol.routes = list(solution.routes)
+        # Per-route costs carry over; get_cost re-sums only replaced routes
+        copy_sol._cost_cache = solution._cost_cache
         return copy_sol
 
 
@@ -410,30 +738,37 @@ class IteratedLocalSearch:
         self.perturbation = Perturbation(instance)
         self.route_improver = RouteImprovement(instance)
         
+        # One validator for every solution check in solve()
+        self._validator = FeasibilityValidator(instance)
+        
         # Best known solutions for comparison
-        self.best_known = self._load_best_known_solutions()
+        self.best_known = _load_best_known_solutions()
         
         # Statistics
         self.iteration_history = []
+        
+        # Best Solution of the last solve(); kept out of the JSON-safe results dict
+        self.best_solution = None
     
     def solve(self) -> Dict:
         """Run complete ILS framework"""
-        print(f"Starting ILS for instance {self.instance.name}")
-        print("="*60)
+        log.info("Starting ILS for instance %s", self.instance.name)
+        log.info("="*60)
         
         start_time = time.time()
+        self.best_solution = None
         
         # 1. Start with feasible solution using improved construction
-        print("Step 1: Generating initial feasible solution")
+        log.info("Step 1: Generating initial feasible solution")
         
         # Try Clarke-Wright first
         # Use Clarke-Wright for better initial solution
-        print("Step 1: Constructing initial solution with Clarke-Wright...")
+        log.info("Step 1: Constructing initial solution with Clarke-Wright...")
         cw = ClarkeWrightPDPTW(self.instance)
         initial_routes = cw.solve(max_time=60)
         
         if not initial_routes or len(initial_routes) == 0:
-            print("Clarke-Wright failed, falling back to Greedy")
+            log.info("Clarke-Wright failed, falling back to Greedy")
             greedy = GreedyInsertion(self.instance)
             initial_routes = greedy.solve()
         
@@ -442,28 +777,29 @@ class IteratedLocalSearch:
         )
         
         # Use LNS to fix infeasible initial solution
-        print("Step 1.5: Using LNS to fix initial solution")
+        log.info("Step 1.5: Using LNS to fix initial solution")
         # Reduce time to leave budget for main ILS iterations
         initial_fix_time = min(20, self.max_time * 0.15)  # 15% of total time, max 20s
-        lns_fixer = LargeNeighborhoodSearch(self.instance, max_iterations=100, max_time=initial_fix_time)
-        lns_fixer.current_solution = initial_solution
-        lns_fixer.best_solution = self._copy_solution(initial_solution)
+        lns_fixer = LargeNeighborhoodSearch(self.instance, max_iterations=100, max_time=initial_fix_time,
+                                            initial_solution=initial_solution)
         current_solution = lns_fixer.solve()
         
         # VALIDATE INITIAL SOLUTION - STRICT CHECK
-        is_feasible, violations = validate_solution(current_solution, self.instance)
+        is_feasible, violations = self._validator.validate_solution(current_solution)
         if not is_feasible:
-            print("ERROR: Initial solution is INFEASIBLE!")
-            print(f"Violations: {violations[:5]}")  # Show first 5 violations
-            print("Cannot proceed with infeasible starting point.")
-            print("This indicates a bug in construction heuristic or LNS repair.")
+            log.error("ERROR: Initial solution is INFEASIBLE!")
+            log.error("Violations: %s", violations[:5])  # Show first 5 violations
+            log.error("Cannot proceed with infeasible starting point.")
+            log.error("This indicates a bug in construction heuristic or LNS repair.")
             return None
         
-        print("SUCCESS: Initial solution is feasible!")
-        print(f"Initial: {current_solution.get_num_vehicles()} vehicles, cost {current_solution.get_cost(self.instance)}")
+        log.info("SUCCESS: Initial solution is feasible!")
+        if log.isEnabledFor(logging.INFO):
+            log.info("Initial: %s vehicles, cost %s", current_solution.get_num_vehicles(), current_solution.get_cost(self.instance))
         
-        # Start with feasible solution
+        # Start with feasible solution; its score only changes on promotion
         best_solution = self._copy_solution(current_solution)
+        best_score = (best_solution.get_num_vehicles(), best_solution.get_cost(self.instance))
         solutions_pool = []
         
         # Early stopping: stop if no improvement for N iterations
@@ -473,32 +809,32 @@ class IteratedLocalSearch:
         # ILS main loop
         for iteration in range(self.max_iterations):
             if time.time() - start_time > self.max_time:
-                print(f"Time limit reached: {self.max_time}s")
+                log.info("Time limit reached: %ss", self.max_time)
                 break
             
             # Early stopping check
             if iterations_without_improvement >= max_iterations_without_improvement:
-                print(f"Early stopping: No improvement for {max_iterations_without_improvement} iterations")
+                log.info("Early stopping: No improvement for %s iterations", max_iterations_without_improvement)
                 break
                 
-            print(f"\n--- ILS Iteration {iteration + 1} ---")
+            log.info("\n--- ILS Iteration %s ---", iteration + 1)
             
             # 2. AGES - Vehicle reduction
-            print("Step 2: AGES - Vehicle reduction")
+            log.info("Step 2: AGES - Vehicle reduction")
             reduced_solution = self.ages.reduce_vehicles(current_solution)
             
             # 2.5 Route Elimination - Direct vehicle minimization
-            print("Step 2.5: Route Elimination - Direct vehicle minimization")
+            log.info("Step 2.5: Route Elimination - Direct vehicle minimization")
             reduced_solution, eliminated = self.route_eliminator.eliminate_routes(
                 reduced_solution, max_iterations=50, max_time=20
             )
             # Clean up empty routes
             reduced_solution.routes = [r for r in reduced_solution.routes if r]
             if eliminated > 0:
-                print(f"  Eliminated {eliminated} route(s), now {len(reduced_solution.routes)} vehicles")
+                log.info("  Eliminated %s route(s), now %s vehicles", eliminated, len(reduced_solution.routes))
             
             # 3. LNS - Cost optimization  
-            print("Step 3: LNS - Cost optimization")
+            log.info("Step 3: LNS - Cost optimization")
             # Use more aggressive LNS if max_time is large
             if self.max_time >= 150:  # Ultra aggressive (3 min)
                 lns_iterations = 3000
@@ -513,89 +849,117 @@ class IteratedLocalSearch:
             lns = LargeNeighborhoodSearch(
                 self.instance, 
                 max_iterations=lns_iterations,
-                max_time=lns_time
+                max_time=lns_time,
+                initial_solution=reduced_solution
             )
-            lns.current_solution = reduced_solution
-            lns.best_solution = self._copy_solution(reduced_solution)
             optimized_solution = lns.solve()
             
             # Apply route improvement after LNS
-            print("Step 3.5: Route improvement (local search)")
+            log.info("Step 3.5: Route improvement (local search)")
             optimized_solution = self.route_improver.improve_solution(optimized_solution, max_time=5.0)
             
             solutions_pool.append(optimized_solution)
             
             # 4. SP - Select best combination
             if len(solutions_pool) > 1:
-                print("Step 4: SP - Set partitioning")
+                log.info("Step 4: SP - Set partitioning")
                 current_solution = self.set_partitioning.select_best_combination(solutions_pool)
             else:
                 current_solution = optimized_solution
             
             # VALIDATE SOLUTION BEFORE ACCEPTING - STRICT CHECK
-            is_valid, violations = validate_solution(current_solution, self.instance)
+            is_valid, violations = self._validator.validate_solution(current_solution)
             
             if not is_valid:
-                print(f"WARNING: Solution at iteration {iteration+1} is INFEASIBLE!")
-                print(f"  Example violation: {violations[0] if violations else 'unknown'}")
+                log.warning("WARNING: Solution at iteration %s is INFEASIBLE!", iteration+1)
+                log.warning("  Example violation: %s", violations[0] if violations else 'unknown')
                 # Revert to last good solution - DON'T accept infeasible!
                 current_solution = self._copy_solution(best_solution)
                 continue  # Skip to next iteration
             
-            # Update best solution - ONLY IF FEASIBLE!
-            if self._is_better_solution(current_solution, best_solution):
+            # Score the current solution once; the comparison, log line and
+            # history entry below all reuse it
+            current_vehicles = current_solution.get_num_vehicles()
+            current_cost = current_solution.get_cost(self.instance)
+            
+            # Update best solution - ONLY IF FEASIBLE! (vehicles first, then cost)
+            if (current_vehicles, current_cost) < best_score:
                 best_solution = self._copy_solution(current_solution)
+                best_score = (current_vehicles, current_cost)
                 iterations_without_improvement = 0  # Reset counter
-                print(f"*** NEW BEST FEASIBLE: {best_solution.get_num_vehicles()} vehicles, cost {best_solution.get_cost(self.instance)} ***")
+                log.info("*** NEW BEST FEASIBLE: %s vehicles, cost %s ***", current_vehicles, current_cost)
             else:
                 iterations_without_improvement += 1
             
             # Record iteration
             self.iteration_history.append({
                 'iteration': iteration + 1,
-                'vehicles': current_solution.get_num_vehicles(),
-                'cost': current_solution.get_cost(self.instance),
+                'vehicles': current_vehicles,
+                'cost': current_cost,
                 'time': time.time() - start_time
             })
             
             # 5. Perturbation for next iteration
             if iteration < self.max_iterations - 1:
-                print("Step 5: Perturbation")
+                log.info("Step 5: Perturbation")
                 current_solution = self.perturbation.perturb_solution(current_solution, intensity=2)
         
         total_time = time.time() - start_time
         
         # FINAL VALIDATION - STRICT
-        is_final_valid, final_violations = validate_solution(best_solution, self.instance)
+        is_final_valid, final_violations = self._validator.validate_solution(best_solution)
         
         # Calculate final metrics
         results = self._calculate_final_metrics(best_solution, total_time)
         results['is_feasible'] = is_final_valid
+        self.best_solution = best_solution
         
-        print("\n" + "="*60)
-        print("ILS COMPLETED")
-        print("="*60)
-        print(f"Best solution: {results['vehicles']} vehicles, cost {results['cost']}")
-        print(f"Feasible solution: {'YES' if is_final_valid else 'NO'}")
-        print(f"Vehicle gap: {results['gap_vehicles']:.2f}%")
-        print(f"Cost gap: {results['gap_cost']:.2f}%")
-        print(f"Total time: {total_time:.2f}s")
+        log.info("\n" + "="*60)
+        log.info("ILS COMPLETED")
+        log.info("="*60)
+        log.info("Best solution: %s vehicles, cost %s", results['vehicles'], results['cost'])
+        log.info("Feasible solution: %s", 'YES' if is_final_valid else 'NO')
+        log.info("Vehicle gap: %.2f%%", results['gap_vehicles'])
+        log.info("Cost gap: %.2f%%", results['gap_cost'])
+        log.info("Total time: %.2fs", total_time)
         
         if not is_final_valid:
-            print("[WARNING] Final solution is NOT feasible!")
-            print(f"  Violations: {final_violations[:3]}")  # Show first 3
+            log.warning("[WARNING] Final solution is NOT feasible!")
+            log.warning("  Violations: %s", final_violations[:3])  # Show first 3
         
         return results
     
-    def _is_better_solution(self, sol1: Solution, sol2: Solution) -> bool:
-        """Compare two solutions (vehicles first, then cost)"""
-        vehicles1 = sol1.get_num_vehicles()
-        vehicles2 = sol2.get_num_vehicles()
+    def solve_parallel(self, n_workers: int = 4, seed: Optional[int] = None) -> Optional[Dict]:
+        """
+        Multistart ILS: independent trajectories in worker processes
         
-        if vehicles1 != vehicles2:
-            return vehicles1 < vehicles2
-            
-        return sol1.get_cost(self.instance) < sol2.get_cost(self.instance)
+        Each worker runs a full solve() from its own random seed with this
+        object's settings; SP then picks the best of the feasible results.
+        
+        Returns:
+            Results dict of the selected trajectory, or None if all failed
+        """
+        seed_rng = random.Random(seed)
+        seeds = [seed_rng.randrange(2 ** 31) for _ in range(n_workers)]
+        
+        start_time = time.time()
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [pool.submit(_solve_trajectory, self.instance, self.max_iterations,
+                                   self.max_time, self.no_improvement_limit, worker_seed)
+                       for worker_seed in seeds]
+            all_results = [future.result() for future in futures]
+        
+        all_results = [(results, solution) for results, solution in all_results if results is not None]
+        if not all_results:
+            return None
+        candidates = [pair for pair in all_results if pair[0]['is_feasible']] or all_results
+        
+        best = self.set_partitioning.select_best_combination([solution for _, solution in candidates])
+        results = next(results for results, solution in candidates if solution is best)
+        self.best_solution = best
+        results['runtime'] = time.time() - start_time
+        results['workers'] = n_workers
+        return results
     
     def _calculate_final_metrics(self, solution: Solution, runtime: float) -> Dict:
         """Calculate evaluation metrics"""
@@ -624,39 +988,18 @@ class IteratedLocalSearch:
             'history': self.iteration_history
         }
     
-    def _load_best_known_solutions(self) -> Dict:
-        """Load best known solutions from bks.dat"""
-        best_known = {}
-        
-        try:
-            with open('../solutions/bks.dat', 'r') as f:
-                lines = f.readlines()[1:]  # Skip header
-                
-                for line in lines:
-                    parts = line.strip().split(';')
-                    if len(parts) >= 4:
-                        instance_name = parts[0]
-                        vehicles = int(parts[2])
-                        cost = int(parts[3])
-                        
-                        best_known[instance_name] = {
-                            'vehicles': vehicles,
-                            'cost': cost
-                        }
-        except FileNotFoundError:
-            print("Warning: Best known solutions file not found")
-        
-        return best_known
-    
     def _copy_solution(self, solution: Solution) -> Solution:
         """Deep copy solution"""
-        copy_sol = Solution()
-        copy_sol.inst_name = solution.inst_name
-        copy_sol.authors = solution.authors
-        copy_sol.date = solution.date
-        copy_sol.reference = solution.reference
-        copy_sol.routes = [route[:] for route in solution.routes]
-        return copy_sol
+        return solution.clone()
+
+
+def _solve_trajectory(instance: Instance, max_iterations: int, max_time: int,
+                      no_improvement_limit: int, seed: int) -> Tuple[Optional[Dict], Optional[Solution]]:
+    """Worker for IteratedLocalSearch.solve_parallel: one seeded ILS run"""
+    random.seed(seed)
+    ils = IteratedLocalSearch(instance, max_iterations, max_time, no_improvement_limit)
+    results = ils.solve()
+    return results, ils.best_solution
 
 
 def test_ils_on_n100():
@@ -687,7 +1030,7 @@ def test_ils_on_n100():
             return None
         
         # Add solution and instance to results for validation  
-        results['solution'] = results.get('solution', None)
+        results['solution'] = ils.best_solution
         results['instance'] = instance
         
         # Print formatted results
@@ -713,6 +1056,7 @@ def test_ils_on_n100():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("ILS Framework for PDPTW")
     print("Testing on n100 instance...")
     test_ils_on_n100()
@@ -7,6 +7,27 @@ from typing import Tuple
 from data_loader import Instance, Solution
 
 
+# Bits reserved for the cost in a packed score
+COST_BITS = 40
+
+
+def pack_score(vehicles: int, cost: int) -> int:
+    """
+    Pack the lexicographic (vehicles, cost) score into one int
+    
+    Comparing packed scores orders by vehicles first, then cost, with a
+    single int comparison instead of a tuple comparison.
+    """
+    if not 0 <= cost < (1 << COST_BITS):
+        raise ValueError(f"cost {cost} does not fit in {COST_BITS} bits")
+    return (vehicles << COST_BITS) | cost
+
+
+def unpack_score(score: int) -> Tuple[int, int]:
+    """Split a packed score back into (vehicles, cost)"""
+    return score >> COST_BITS, score & ((1 << COST_BITS) - 1)
+
+
 class LAHCAcceptance:
     """
     Late Acceptance Hill Climbing acceptance criterion
@@ -23,7 +44,7 @@ class LAHCAcceptance:
             history_length: Number of past costs to remember (L parameter)
         """
         self.history_length = history_length
-        self.cost_history = []
+        self.cost_history = []       # packed scores, see pack_score
         self.history_index = 0
         self.initialized = False
         
@@ -37,7 +58,7 @@ class LAHCAcceptance:
         """Initialize the cost history with the initial solution"""
         initial_vehicles = initial_solution.get_num_vehicles()
         initial_cost = initial_solution.get_cost(instance)
-        initial_score = (initial_vehicles, initial_cost)
+        initial_score = pack_score(initial_vehicles, initial_cost)
         
         # Fill history with initial cost
         self.cost_history = [initial_score] * self.history_length
@@ -60,27 +81,36 @@ class LAHCAcceptance:
         Returns:
             (should_accept, reason) where reason is a string explaining the decision
         """
-        if not self.initialized:
-            raise RuntimeError("LAHC not initialized. Call initialize() first.")
-        
-        self.total_evaluations += 1
-        
         # Calculate scores (lexicographic: vehicles first, then cost)
         candidate_vehicles = candidate_solution.get_num_vehicles()
         candidate_cost = candidate_solution.get_cost(instance)
-        candidate_score = (candidate_vehicles, candidate_cost)
+        candidate_score = pack_score(candidate_vehicles, candidate_cost)
+        
+        # Routes may have been edited in place since the last call, so the
+        # current solution is rescored every time; get_cost is memoized on
+        # the route contents, which keeps this cheap
+        current_score = pack_score(current_solution.get_num_vehicles(), current_solution.get_cost(instance))
+        
+        return self.should_accept_score(candidate_score, current_score)
+    
+    def should_accept_score(self, candidate_score: int, current_score: int) -> Tuple[bool, str]:
+        """
+        should_accept on packed scores, see pack_score
         
-        current_vehicles = current_solution.get_num_vehicles()
-        current_cost = current_solution.get_cost(instance)
-        current_score = (current_vehicles, current_cost)
+        For callers that keep the scores of their solutions, so that no cost
+        is recomputed here.
+        """
+        if not self.initialized:
+            raise RuntimeError("LAHC not initialized. Call initialize() first.")
+        
+        self.total_evaluations += 1
         
         # Get comparison score from history
-        comparison_score = self.cost_history[self.history_index]
+        cost_history = self.cost_history
+        history_index = self.history_index
+        comparison_score = cost_history[history_index]
         
         # Decide acceptance
-        accept = False
-        reason = ""
-        
         if candidate_score < current_score:
             # Better than current - always accept
             accept = True
@@ -99,8 +129,11 @@ class LAHCAcceptance:
         
         # Update history (circular buffer) - update with CURRENT cost, not candidate
         # This is the key LAHC mechanism: we compare against past, but store current
-        self.cost_history[self.history_index] = current_score
-        self.history_index = (self.history_index + 1) % self.history_length
+        # Wrap with a compare instead of a modulo; L is kept as configured
+        # rather than rounded up to a power of two for a mask
+        cost_history[history_index] = current_score
+        history_index += 1
+        self.history_index = history_index if history_index < self.history_length else 0
         
         return accept, reason
     
@@ -3,17 +3,41 @@ Large Neighborhood Search (LNS) for PDPTW
 Destroy-Repair based metaheuristic with LAHC acceptance and strict feasibility
 """
 
+import heapq
+import logging
 import random
 import math
 import time
-from typing import List, Tuple, Set, Optional
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from operator import getitem, itemgetter
+from typing import Callable, List, Tuple, Set, Optional
 from data_loader import Instance, Solution
 from solution_encoder import SolutionEncoder
 from construction_heuristic import GreedyInsertion
-from feasibility_validator import validate_solution
-from lahc_acceptance import LAHCAcceptance
+from feasibility_validator import FeasibilityValidator
+from lahc_acceptance import LAHCAcceptance, pack_score, unpack_score
 from route_improvement import RouteImprovement
 
+log = logging.getLogger(__name__)
+
+
+# Adaptive operator selection (discounted UCB1): weight of the exploration
+# bonus and the decay applied to every operator's statistics per pick
+UCB_EXPLORATION = math.sqrt(2)
+UCB_DISCOUNT = 0.99
+
+# Shaw removal: statically most related pickups kept per pickup
+SHAW_NEIGHBORS = 50
+
+# Pool search: steps between handing the best solution to the worst slot
+POOL_SHARE_INTERVAL = 25
+
+# Seconds between progress reports, and at least between new-best reports
+PROGRESS_INTERVAL = 10.0
+NEW_BEST_LOG_INTERVAL = 1.0
+
 
 class LargeNeighborhoodSearch:
     """Large Neighborhood Search metaheuristic for PDPTW with strict feasibility"""
@@ -23,17 +47,42 @@ class LargeNeighborhoodSearch:
                  max_time: int = 300,
                  min_destroy_size: int = 10,
                  max_destroy_size: int = 60,
-                 lahc_history: int = 1000):
+                 lahc_history: int = 1000,
+                 initial_solution: Optional[Solution] = None,
+                 n_workers: int = 1,
+                 pool_size: int = 1):
         self.instance = instance
         self.max_iterations = max_iterations
         self.max_time = max_time
         self.min_destroy_size = min_destroy_size
         self.max_destroy_size = max_destroy_size
+        self.n_workers = n_workers  # destroy-repair trials run side by side per step
+        self.pool_size = pool_size  # incumbents searched in parallel, each with its own LAHC
         
-        # Initialize with greedy solution
-        greedy = GreedyInsertion(instance)
-        routes = greedy.solve()
-        self.current_solution = SolutionEncoder.create_solution_from_routes(routes, instance.name, "Initial")
+        # Per-node data as flat lists for the destroy/repair hot loops
+        self._dem = [node.dem for node in instance.nodes]
+        self._etw = [node.etw for node in instance.nodes]
+        self._ltw = [node.ltw for node in instance.nodes]
+        self._dur = [node.dur for node in instance.nodes]
+        self._pair = [node.pair for node in instance.nodes]
+        self._pickups = [node_id for node_id, dem in enumerate(self._dem) if dem > 0]
+        
+        # Cost of opening a route for a pair depends only on the matrix, so it
+        # is priced once per pickup instead of once per pair per iteration
+        self._new_route_cost = [float('inf')] * instance.size
+        for pickup in self._pickups:
+            self._new_route_cost[pickup] = self._calculate_new_pair_route_cost(pickup, self._pair[pickup])
+        
+        # Shaw relatedness tables, filled on first use
+        self._shaw_neighbors = {}  # pickup -> most related pickups, best first
+        self._shaw_rows = {}       # pickup -> static relatedness of each node to it
+        
+        # Initialize with greedy solution unless a start is given
+        if initial_solution is None:
+            greedy = GreedyInsertion(instance)
+            routes = greedy.solve()
+            initial_solution = SolutionEncoder.create_solution_from_routes(routes, instance.name, "Initial")
+        self.current_solution = initial_solution
         self.best_solution = self._copy_solution(self.current_solution)
         
         # ENHANCED operator set with Worst Removal
@@ -47,13 +96,31 @@ class LargeNeighborhoodSearch:
             ('greedy', self._greedy_pair_insertion),
             ('regret_k', self._regret_k_insertion)  # Variable k (2-5)
         ]
+        self._destroy_by_name = dict(self.destroy_operators)
+        self._repair_by_name = dict(self.repair_operators)
         
-        # LAHC acceptance (instead of simple improvement)
+        # Bandit statistics per operator: discounted pulls and summed reward,
+        # rewards being relative improvement per second of trial time
+        self.destroy_pulls = [0.0] * len(self.destroy_operators)
+        self.destroy_rewards = [0.0] * len(self.destroy_operators)
+        self.repair_pulls = [0.0] * len(self.repair_operators)
+        self.repair_rewards = [0.0] * len(self.repair_operators)
+        self._reward_scale = 0.0  # largest reward seen, which maps rewards into [0, 1]
+        
+        # LAHC acceptance (instead of simple improvement); one per pool slot,
+        # self.lahc being the first
         self.lahc = LAHCAcceptance(history_length=lahc_history)
+        self.lahcs = [self.lahc] + [LAHCAcceptance(history_length=lahc_history) for _ in range(pool_size - 1)]
+        
+        # Incumbents of the batch search, filled from current_solution in solve()
+        self.pool: List[Solution] = []
         
         # Route improvement (local search)
         self.route_improver = RouteImprovement(instance)
         
+        # One validator for the feasibility gate of every iteration
+        self._validator = FeasibilityValidator(instance)
+        
         # Statistics
         self.iterations = 0
         self.improvements = 0
@@ -71,177 +138,357 @@ class LargeNeighborhoodSearch:
         - LAHC is applied ONLY after feasibility passes
         - Never accept infeasible solutions, even temporarily
         """
-        print(f"Starting LNS with strict feasibility...")
-        print(f"Initial solution: {self.current_solution.get_num_vehicles()} vehicles, "
-              f"cost = {self.current_solution.get_cost(self.instance)}")
+        log.info("Starting LNS with strict feasibility...")
+        if log.isEnabledFor(logging.INFO):
+            log.info("Initial solution: %s vehicles, cost = %s",
+                     self.current_solution.get_num_vehicles(), self.current_solution.get_cost(self.instance))
         
         # Validate initial solution
-        is_feasible, violations = validate_solution(self.current_solution, self.instance)
+        is_feasible, violations = self._validator.validate_solution(self.current_solution)
         if not is_feasible:
-            print(f"WARNING: Initial solution is INFEASIBLE!")
-            print(f"Violations: {violations}")
-            print(f"Will try to find feasible solution during search...")
+            log.warning("WARNING: Initial solution is INFEASIBLE!")
+            log.warning("Violations: %s", violations)
+            log.warning("Will try to find feasible solution during search...")
         
-        # Initialize LAHC with initial solution
-        self.lahc.initialize(self.current_solution, self.instance)
+        # Every pool slot starts from the initial solution, with its LAHC
+        # initialized on it; slot 0 is current_solution itself
+        self.pool = [self.current_solution] + [self._share_solution(self.current_solution)
+                                               for _ in range(self.pool_size - 1)]
+        for lahc in self.lahcs:
+            lahc.initialize(self.current_solution, self.instance)
+        
+        # A slot whose incumbent is known feasible lets its trials validate
+        # only the routes they replaced
+        slot_feasible = [is_feasible] * self.pool_size
+        
+        # Packed scores of the incumbents and the best, kept in step with them
+        # so that each trial only scores its neighbor
+        slot_scores = [self._score(self.current_solution)] * self.pool_size
+        best_score = self._score(self.best_solution)
+        best_feasible = is_feasible
+        steps = 0
         
         start_time = time.time()
         last_progress_time = start_time
+        last_best_log_time = start_time - NEW_BEST_LOG_INTERVAL
         
-        while (self.iterations < self.max_iterations and
-               time.time() - start_time < self.max_time):
-            
-            self.iterations += 1
-            
-            # Select destroy and repair operators (round-robin for simplicity)
-            destroy_idx = (self.iterations - 1) % len(self.destroy_operators)
-            repair_idx = (self.iterations - 1) % len(self.repair_operators)
-            
-            destroy_op = self.destroy_operators[destroy_idx][0]
-            repair_op = self.repair_operators[repair_idx][0]
-            
-            # Determine destroy size (number of PAIRS to remove)
-            destroy_size = random.randint(self.min_destroy_size, self.max_destroy_size)
-            
-            # Create neighbor solution
-            neighbor = self._create_neighbor(destroy_op, repair_op, destroy_size)
-            
-            if neighbor is None:
-                self.repair_failures += 1
-                continue
-            
-            # Apply route improvement every 20 iterations (to save time)
-            if self.iterations % 20 == 0:
-                neighbor = self.route_improver.improve_solution(neighbor, max_time=2.0)
-            
-            # === GATE 1: FEASIBILITY CHECK (MANDATORY) ===
-            is_feasible, violations = validate_solution(neighbor, self.instance)
-            
-            if not is_feasible:
-                self.rejected_infeasible += 1
-                # Log violations periodically
-                if self.iterations % 100 == 0:
-                    print(f"  [Infeasible at iter {self.iterations}] Example: {violations[0] if violations else 'unknown'}")
-                continue  # REJECT immediately, no further consideration
-            
-            # === GATE 2: LAHC ACCEPTANCE (only for feasible solutions) ===
-            should_accept, reason = self.lahc.should_accept(
-                neighbor, self.current_solution, self.instance
-            )
-            
-            if should_accept:
-                # Accept neighbor as new current solution
-                self.current_solution = self._copy_solution(neighbor)
+        # With several workers, each step runs one trial per worker on every
+        # pool slot; the instance is shipped to each process once
+        executor = None
+        if self.n_workers > 1:
+            executor = ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_trial_worker,
+                                       initargs=(self.instance,))
+        
+        try:
+            while (self.iterations < self.max_iterations and
+                   time.time() - start_time < self.max_time):
                 
-                if reason == "better_than_current":
-                    self.improvements += 1
-                elif reason == "better_than_history":
-                    self.accepted_worse += 1
+                trials = []
+                while (len(trials) < self.n_workers * self.pool_size and
+                       self.iterations < self.max_iterations):
+                    self.iterations += 1
+                    slot = len(trials) // self.n_workers
+                    
+                    # Select destroy and repair operators by adaptive weight
+                    destroy_idx, repair_idx = self._select_operators()
+                    
+                    # Determine destroy size (number of PAIRS to remove)
+                    destroy_size = random.randint(self.min_destroy_size, self.max_destroy_size)
+                    
+                    # Apply route improvement every 20 iterations (to save time)
+                    improve = self.iterations % 20 == 0
+                    
+                    trials.append((self.iterations, slot, destroy_idx, repair_idx, destroy_size, improve,
+                                   slot_feasible[slot]))
                 
-                # Update global best if better
-                if self._is_better_solution(neighbor, self.best_solution):
-                    self.best_solution = self._copy_solution(neighbor)
-                    print(f"[{self.iterations}] NEW BEST: {self.best_solution.get_num_vehicles()} veh, "
-                          f"cost {self.best_solution.get_cost(self.instance)}")
-            else:
-                self.rejected_by_lahc += 1
-            
-            # Progress update every 10 seconds
-            current_time = time.time()
-            if current_time - last_progress_time >= 10:
-                elapsed = current_time - start_time
-                print(f"[{self.iterations}] Current: {self.current_solution.get_num_vehicles()} veh, "
-                      f"cost {self.current_solution.get_cost(self.instance)} | "
-                      f"Best: {self.best_solution.get_num_vehicles()} veh, "
-                      f"cost {self.best_solution.get_cost(self.instance)} | "
-                      f"Time: {elapsed:.1f}s")
-                last_progress_time = current_time
+                if executor is None:
+                    results = [self._run_trial(self.pool[slot], iteration, self.destroy_operators[destroy_idx][0],
+                                               self.repair_operators[repair_idx][0], destroy_size, improve,
+                                               partial)
+                               for iteration, slot, destroy_idx, repair_idx, destroy_size, improve, partial in trials]
+                else:
+                    futures = [executor.submit(_run_trial_in_worker, self.pool[slot].routes, iteration,
+                                               self.destroy_operators[destroy_idx][0],
+                                               self.repair_operators[repair_idx][0], destroy_size, improve,
+                                               partial, random.randrange(2 ** 31))
+                               for iteration, slot, destroy_idx, repair_idx, destroy_size, improve, partial in trials]
+                    results = [self._trial_result(self.pool[trial[1]], *future.result())
+                               for trial, future in zip(trials, futures)]
+                
+                # Trials are judged in order; per slot, the first one its LAHC
+                # accepts wins and the slot's later trials are dropped
+                accepted_slots = set()
+                for (iteration, slot, destroy_idx, repair_idx, *_, partial), result in zip(trials, results):
+                    if slot in accepted_slots:
+                        continue
+                    neighbor, is_feasible, violations, trial_time = result
+                    reason = None
+                    improvement = 0.0
+                    neighbor_score = self._score(neighbor) if is_feasible else None
+                    
+                    # A partially validated neighbor still gets the full
+                    # validator before it can become the global best
+                    if partial and is_feasible and neighbor_score < best_score:
+                        is_feasible, violations = self._validator.validate_solution(neighbor)
+                    
+                    if neighbor is None:
+                        self.repair_failures += 1
+                    
+                    # === GATE 1: FEASIBILITY CHECK (MANDATORY) ===
+                    elif not is_feasible:
+                        self.rejected_infeasible += 1
+                        # Log violations periodically
+                        if iteration % 100 == 0:
+                            log.debug("  [Infeasible at iter %s] Example: %s",
+                                      iteration, violations[0] if violations else 'unknown')
+                        # REJECT immediately, no further consideration
+                    
+                    # === GATE 2: LAHC ACCEPTANCE (only for feasible solutions) ===
+                    else:
+                        should_accept, reason = self.lahcs[slot].should_accept_score(
+                            neighbor_score, slot_scores[slot]
+                        )
+                        
+                        if should_accept:
+                            # Accept neighbor as the slot's new incumbent; it is
+                            # never edited in place, so no copy is needed
+                            self.pool[slot] = neighbor
+                            improvement = self._relative_improvement(neighbor_score, slot_scores[slot])
+                            slot_scores[slot] = neighbor_score
+                            slot_feasible[slot] = True
+                            accepted_slots.add(slot)
+                            
+                            if reason == "better_than_current":
+                                self.improvements += 1
+                            elif reason == "better_than_history":
+                                self.accepted_worse += 1
+                            
+                            # Update global best if better
+                            if neighbor_score < best_score:
+                                best_score = neighbor_score
+                                best_feasible = True
+                                # Neighbors are never edited in place either; the
+                                # best only gets its own route lists once solve ends
+                                self.best_solution = neighbor
+                                # Improvements come in bursts; report at most
+                                # one per interval instead of each of them
+                                now = time.time()
+                                if now - last_best_log_time >= NEW_BEST_LOG_INTERVAL:
+                                    log.info("[%s] NEW BEST: %s veh, cost %s", iteration,
+                                             *unpack_score(best_score))
+                                    last_best_log_time = now
+                        else:
+                            self.rejected_by_lahc += 1
+                    
+                    self._credit_operators(destroy_idx, repair_idx, improvement, trial_time)
+                
+                # Slots search independently, but every so often the one
+                # furthest behind restarts from the best found so far
+                steps += 1
+                if self.pool_size > 1 and steps % POOL_SHARE_INTERVAL == 0:
+                    worst = max(range(self.pool_size), key=slot_scores.__getitem__)
+                    if slot_scores[worst] > best_score:
+                        self.pool[worst] = self.best_solution
+                        slot_scores[worst] = best_score
+                        slot_feasible[worst] = best_feasible
+                
+                self.current_solution = self.pool[0]
+                
+                # Progress update every PROGRESS_INTERVAL seconds
+                current_time = time.time()
+                if current_time - last_progress_time >= PROGRESS_INTERVAL:
+                    elapsed = current_time - start_time
+                    log.info("[%s] Current: %s veh, cost %s | Best: %s veh, cost %s | Time: %.1fs",
+                             self.iterations, *unpack_score(slot_scores[0]), *unpack_score(best_score), elapsed)
+                    last_progress_time = current_time
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        self.best_solution = self._copy_solution(self.best_solution)
         
         elapsed = time.time() - start_time
         
         # Final validation
-        is_final_feasible, final_violations = validate_solution(self.best_solution, self.instance)
-        
-        print(f"\n{'='*70}")
-        print(f"LNS COMPLETED")
-        print(f"{'='*70}")
-        print(f"Iterations: {self.iterations}")
-        print(f"Improvements: {self.improvements}")
-        print(f"Accepted worse: {self.accepted_worse}")
-        print(f"Rejected (infeasible): {self.rejected_infeasible}")
-        print(f"Rejected (LAHC): {self.rejected_by_lahc}")
-        print(f"Repair failures: {self.repair_failures}")
-        print(f"Time: {elapsed:.2f}s")
-        print(f"Best solution: {self.best_solution.get_num_vehicles()} vehicles, "
-              f"cost = {self.best_solution.get_cost(self.instance)}")
-        print(f"Final feasibility: {'YES' if is_final_feasible else 'NO'}")
+        is_final_feasible, final_violations = self._validator.validate_solution(self.best_solution)
+        
+        log.info("\n" + "="*70)
+        log.info("LNS COMPLETED")
+        log.info("="*70)
+        log.info("Iterations: %s", self.iterations)
+        log.info("Improvements: %s", self.improvements)
+        log.info("Accepted worse: %s", self.accepted_worse)
+        log.info("Rejected (infeasible): %s", self.rejected_infeasible)
+        log.info("Rejected (LAHC): %s", self.rejected_by_lahc)
+        log.info("Repair failures: %s", self.repair_failures)
+        log.info("Time: %.2fs", elapsed)
+        log.info("Best solution: %s vehicles, cost = %s", *unpack_score(best_score))
+        log.info("Final feasibility: %s", 'YES' if is_final_feasible else 'NO')
         
         if not is_final_feasible:
-            print(f"WARNING: Final solution is INFEASIBLE!")
-            print(f"Violations: {final_violations[:3]}...")  # Show first 3
+            log.warning("WARNING: Final solution is INFEASIBLE!")
+            log.warning("Violations: %s...", final_violations[:3])  # Show first 3
         
-        lahc_stats = self.lahc.get_statistics()
-        print(f"LAHC acceptance rate: {lahc_stats['acceptance_rate']:.1f}%")
-        print(f"{'='*70}")
+        if log.isEnabledFor(logging.INFO):
+            evaluations = sum(lahc.total_evaluations for lahc in self.lahcs)
+            accepted = sum(lahc.accepted_better + lahc.accepted_worse for lahc in self.lahcs)
+            log.info("LAHC acceptance rate: %.1f%%", accepted / evaluations * 100 if evaluations else 0.0)
+            log.info("Operator pulls: %s", ", ".join(
+                f"{name} {pulls:.1f}" for (name, _), pulls in
+                zip(self.destroy_operators + self.repair_operators, self.destroy_pulls + self.repair_pulls)))
+        log.info("="*70)
         
         return self.best_solution
     
-    def _is_better_solution(self, sol1: Solution, sol2: Solution) -> bool:
-        """Compare two solutions (lexicographic: vehicles first, then cost)"""
-        vehicles1 = sol1.get_num_vehicles()
-        vehicles2 = sol2.get_num_vehicles()
+    def _score(self, solution: Solution) -> int:
+        """Packed (vehicles, cost) score; lower is better, see pack_score"""
+        return pack_score(solution.get_num_vehicles(), solution.get_cost(self.instance))
+    
+    @staticmethod
+    def _relative_improvement(new_score: int, old_score: int) -> float:
+        """Gain of new over old: 1 for a vehicle saved, else the fraction of cost saved"""
+        new_vehicles, new_cost = unpack_score(new_score)
+        old_vehicles, old_cost = unpack_score(old_score)
+        if new_vehicles != old_vehicles:
+            return 1.0 if new_vehicles < old_vehicles else 0.0
+        return max(old_cost - new_cost, 0) / old_cost if old_cost else 0.0
+    
+    def _run_trial(self, solution: Solution, iteration: int, destroy_op: str, repair_op: str, destroy_size: int,
+                   improve: bool, partial: bool = False) -> Tuple[Optional[Solution], bool, List[str], float]:
+        """
+        One destroy-repair trial on the given incumbent
+        
+        iteration is the trial's number in the solve loop; it throttles the
+        error log, since worker processes keep no iteration count of their own.
+        With partial=True the incumbent is known feasible and only the routes
+        the trial replaced are validated, see _validate_changes.
+        
+        Returns (neighbor, is_feasible, violations, trial_time); neighbor is
+        None if the repair failed.
+        """
+        start_time = time.time()
+        # The one guard of the destroy-repair path: a failing operator costs
+        # the trial, not the run
+        try:
+            neighbor = self._create_neighbor(destroy_op, repair_op, destroy_size, solution)
+        except Exception as e:
+            if iteration % 100 == 0:
+                log.warning("Error in _create_neighbor: %s", e)
+            neighbor = None
+        if neighbor is None:
+            return None, False, [], time.time() - start_time
         
-        if vehicles1 != vehicles2:
-            return vehicles1 < vehicles2
+        if improve:
+            neighbor = self.route_improver.improve_solution(neighbor, max_time=2.0)
         
-        return sol1.get_cost(self.instance) < sol2.get_cost(self.instance)
+        if partial:
+            is_feasible, violations = self._validate_changes(solution, neighbor)
+        else:
+            is_feasible, violations = self._validator.validate_solution(neighbor)
+        return neighbor, is_feasible, violations, time.time() - start_time
     
-    def _create_neighbor(self, destroy_op: str, repair_op: str, destroy_size: int) -> Optional[Solution]:
+    def _validate_changes(self, incumbent: Solution, neighbor: Solution) -> Tuple[bool, List[str]]:
+        """
+        Validate a neighbor of a feasible incumbent by its replaced routes
+        
+        Neighbors are built copy-on-write, so a route list still shared with
+        the incumbent is unchanged and already known feasible. The new routes
+        must serve exactly the nodes of the incumbent routes they replace;
+        with no duplicates among them, which validate_routes checks, every
+        node stays served once.
+        """
+        kept = {id(route) for route in incumbent.routes}
+        current = {id(route) for route in neighbor.routes}
+        changed = [idx for idx, route in enumerate(neighbor.routes) if id(route) not in kept]
+        
+        new_nodes = [node for idx in changed for node in neighbor.routes[idx]]
+        old_nodes = [node for route in incumbent.routes if id(route) not in current for node in route]
+        if len(new_nodes) != len(old_nodes) or set(new_nodes) != set(old_nodes):
+            return False, ["Replaced routes do not serve the same nodes as before"]
+        
+        return self._validator.validate_routes(neighbor, changed)
+    
+    def _trial_result(self, solution: Solution, routes: Optional[List[List[int]]], is_feasible: bool,
+                      violations: List[str], trial_time: float) -> Tuple[Optional[Solution], bool, List[str], float]:
+        """Rebuild a worker's trial result around the incumbent it started from"""
+        if routes is None:
+            return None, False, [], trial_time
+        neighbor = self._share_solution(solution)
+        neighbor.routes = routes
+        return neighbor, is_feasible, violations, trial_time
+    
+    def _credit_operators(self, destroy_idx: int, repair_idx: int, improvement: float, trial_time: float):
+        """
+        Add a trial's reward, its improvement per second, to both operators
+        
+        Scaling by trial time lets a cheap operator that gains as much as an
+        expensive one earn the larger reward.
+        """
+        reward = improvement / max(trial_time, 1e-3)
+        self._reward_scale = max(self._reward_scale, reward)
+        self.destroy_rewards[destroy_idx] += reward
+        self.repair_rewards[repair_idx] += reward
+    
+    def _select_operators(self) -> Tuple[int, int]:
+        """
+        Discounted UCB1 pick of a destroy and a repair operator
+        
+        The pull is counted at the pick rather than at the credit, so the
+        trials of a batch, all picked before any is credited, spread over
+        the operators instead of all taking the same one.
+        """
+        return (self._ucb_pick(self.destroy_pulls, self.destroy_rewards),
+                self._ucb_pick(self.repair_pulls, self.repair_rewards))
+    
+    def _ucb_pick(self, pulls: List[float], rewards: List[float]) -> int:
+        """Index maximizing mean reward plus exploration bonus; untried operators first"""
+        if 0.0 in pulls:
+            chosen = pulls.index(0.0)
+        else:
+            log_total = math.log(max(sum(pulls), 1.0))
+            scale = self._reward_scale or 1.0
+            chosen = max(range(len(pulls)), key=lambda idx: (rewards[idx] / pulls[idx] / scale +
+                                                             UCB_EXPLORATION * math.sqrt(log_total / pulls[idx])))
+        
+        # Discounting lets the choice follow the search as it moves on
+        for idx in range(len(pulls)):
+            pulls[idx] *= UCB_DISCOUNT
+            rewards[idx] *= UCB_DISCOUNT
+        pulls[chosen] += 1.0
+        return chosen
+    
+    def _create_neighbor(self, destroy_op: str, repair_op: str, destroy_size: int,
+                         solution: Optional[Solution] = None) -> Optional[Solution]:
         """
         Create neighbor solution using destroy-repair on PICKUP-DELIVERY PAIRS
         
+        Works on a copy of solution, the current solution by default.
         Returns None if repair fails
         """
-        try:
-            # Create copy of current solution
-            neighbor = self._copy_solution(self.current_solution)
-            
-            # Find destroy operator function
-            destroy_func = None
-            for op_name, op_func in self.destroy_operators:
-                if op_name == destroy_op:
-                    destroy_func = op_func
-                    break
-            
-            # Find repair operator function
-            repair_func = None
-            for op_name, op_func in self.repair_operators:
-                if op_name == repair_op:
-                    repair_func = op_func
-                    break
-            
-            if destroy_func is None or repair_func is None:
-                return None
-            
-            # Destroy phase - removes PAIRS
-            removed_pairs = destroy_func(neighbor, destroy_size)
-            
-            if not removed_pairs:
-                return None
-            
-            # Repair phase - inserts PAIRS back
-            success = repair_func(neighbor, removed_pairs)
-            
-            if not success:
-                return None
-            
-            return neighbor
-            
-        except Exception as e:
-            # Log error but don't crash
-            if self.iterations % 100 == 0:
-                print(f"Error in _create_neighbor: {e}")
+        destroy_func = self._destroy_by_name.get(destroy_op)
+        repair_func = self._repair_by_name.get(repair_op)
+        if destroy_func is None or repair_func is None:
+            return None
+        
+        # Share the incumbent's route lists: destroy builds new lists for
+        # the routes it touches and repair copies a route before inserting,
+        # so the incumbent is never edited and a rejected neighbor costs
+        # no full copy
+        neighbor = self._share_solution(self.current_solution if solution is None else solution)
+        
+        # Destroy phase - removes PAIRS
+        removed_pairs = destroy_func(neighbor, destroy_size)
+        
+        if not removed_pairs:
             return None
+        
+        # Repair phase - inserts PAIRS back
+        success = repair_func(neighbor, removed_pairs)
+        
+        if not success:
+            return None
+        
+        return neighbor
     
     def _get_all_pairs(self) -> List[Tuple[int, int]]:
         """Get all pickup-delivery pairs from instance"""
@@ -256,19 +503,16 @@ class LargeNeighborhoodSearch:
         Random removal: remove k random PICKUP-DELIVERY PAIRS
         Always removes both pickup and delivery together
         """
-        # Collect all pairs present in solution
-        pairs_in_solution = []
-        for route in solution.routes:
-            visited_pickups = set()
+        # Collect all pairs present in solution, without duplicates, with
+        # the route each one is in
+        dem, pair = self._dem, self._pair
+        pair_routes = {}
+        for route_idx, route in enumerate(solution.routes):
+            in_route = set(route)
             for node_id in route:
-                node = self.instance.nodes[node_id]
-                if node.is_pickup():
-                    if node.pair in route:
-                        pairs_in_solution.append((node_id, node.pair))
-                        visited_pickups.add(node_id)
-        
-        # Remove duplicates
-        pairs_in_solution = list(set(pairs_in_solution))
+                if dem[node_id] > 0 and pair[node_id] in in_route:
+                    pair_routes.setdefault((node_id, pair[node_id]), route_idx)
+        pairs_in_solution = list(pair_routes)
         
         if not pairs_in_solution:
             return []
@@ -280,8 +524,8 @@ class LargeNeighborhoodSearch:
         pairs_to_remove = random.sample(pairs_in_solution, k)
         
         # Remove both pickup and delivery from solution
-        for pickup, delivery in pairs_to_remove:
-            self._remove_nodes_from_solution(solution, [pickup, delivery])
+        self._remove_nodes_from_solution(solution, [node for pair in pairs_to_remove for node in pair],
+                                         [pair_routes[pair] for pair in pairs_to_remove])
         
         return pairs_to_remove
     
@@ -294,12 +538,13 @@ class LargeNeighborhoodSearch:
         pairs_in_solution = []
         pair_routes = {}  # Map pair to route index
         
+        dem, partner = self._dem, self._pair
         for route_idx, route in enumerate(solution.routes):
+            in_route = set(route)
             for node_id in route:
-                node = self.instance.nodes[node_id]
-                if node.is_pickup() and node.pair in route:
-                    pair = (node_id, node.pair)
-                    if pair not in pairs_in_solution:
+                if dem[node_id] > 0 and partner[node_id] in in_route:
+                    pair = (node_id, partner[node_id])
+                    if pair not in pair_routes:
                         pairs_in_solution.append(pair)
                         pair_routes[pair] = route_idx
         
@@ -311,63 +556,89 @@ class LargeNeighborhoodSearch:
         # Start with random seed pair
         seed_pair = random.choice(pairs_in_solution)
         removed_pairs = [seed_pair]
-        remaining_pairs = [p for p in pairs_in_solution if p != seed_pair]
+        removed = {seed_pair}
         
-        # Iteratively remove most related pairs
-        while len(removed_pairs) < k and remaining_pairs:
-            best_relatedness = -float('inf')
-            best_pair = None
+        # Candidates are the present pairs among the static neighbors of the
+        # removed ones, scored by summed relatedness to every removed pair
+        # (same order as the mean); each removal adds to the running sums
+        scores = {}
+        while len(removed_pairs) < k:
+            newest = removed_pairs[-1]
+            newest_row = self._relatedness_row(newest[0])
+            newest_route = pair_routes[newest]
+            for pair in scores:
+                scores[pair] += newest_row[pair[0]] + (0.2 if pair_routes[pair] == newest_route else 0.0)
+            for pickup in self._related_pickups(newest[0]):
+                pair = (pickup, partner[pickup])
+                if pair in pair_routes and pair not in removed and pair not in scores:
+                    scores[pair] = sum(self._pair_relatedness(pair, other, pair_routes) for other in removed_pairs)
             
-            for pair in remaining_pairs:
-                relatedness = self._calculate_pair_relatedness(
-                    pair, removed_pairs, pair_routes
-                )
-                if relatedness > best_relatedness:
-                    best_relatedness = relatedness
-                    best_pair = pair
+            if not scores:
+                # Neighborhoods used up: fall back to every remaining pair
+                for pair in pairs_in_solution:
+                    if pair not in removed:
+                        scores[pair] = sum(self._pair_relatedness(pair, other, pair_routes) for other in removed_pairs)
+                if not scores:
+                    break
             
-            if best_pair:
-                removed_pairs.append(best_pair)
-                remaining_pairs.remove(best_pair)
-            else:
-                break
+            # Iteratively remove most related pairs
+            best_pair = max(scores, key=scores.get)
+            del scores[best_pair]
+            removed_pairs.append(best_pair)
+            removed.add(best_pair)
         
         # Remove pairs from solution
-        for pickup, delivery in removed_pairs:
-            self._remove_nodes_from_solution(solution, [pickup, delivery])
+        self._remove_nodes_from_solution(solution, [node for pair in removed_pairs for node in pair],
+                                         [pair_routes[pair] for pair in removed_pairs])
         
         return removed_pairs
     
-    def _calculate_pair_relatedness(self, pair: Tuple[int, int], 
-                                    removed_pairs: List[Tuple[int, int]],
-                                    pair_routes: dict) -> float:
-        """Calculate relatedness score between pair and already removed pairs"""
-        pickup, delivery = pair
-        pickup_node = self.instance.nodes[pickup]
+    def _pair_relatedness(self, pair: Tuple[int, int], other: Tuple[int, int], pair_routes: dict) -> float:
+        """Relatedness of pair to another pair: static part plus same route bonus"""
+        same_route = 1.0 if pair_routes.get(pair) == pair_routes.get(other) else 0.0
+        return self._relatedness_row(other[0])[pair[0]] + 0.2 * same_route
+    
+    def _static_relatedness(self, pickup: int, other_pickup: int) -> float:
+        """Solution-independent relatedness: distance and time window overlap"""
+        etw, ltw = self._etw, self._ltw
         
-        total_relatedness = 0.0
+        # Distance relatedness (closer = more related)
+        distance = self.instance.times[pickup][other_pickup]
+        distance_score = 1.0 - (distance / max(ltw[0], 1))  # Use depot time window as scale
         
-        for removed_pickup, removed_delivery in removed_pairs:
-            removed_pickup_node = self.instance.nodes[removed_pickup]
-            
-            # Distance relatedness (closer = more related)
-            distance = self.instance.get_travel_time(pickup, removed_pickup)
-            max_distance = self.instance.nodes[0].ltw  # Use depot time window as scale
-            distance_score = 1.0 - (distance / max(max_distance, 1))
-            
-            # Time window overlap
-            tw_overlap = min(pickup_node.ltw, removed_pickup_node.ltw) - max(pickup_node.etw, removed_pickup_node.etw)
-            tw_range = max(pickup_node.ltw - pickup_node.etw, removed_pickup_node.ltw - removed_pickup_node.etw, 1)
-            tw_score = max(0, tw_overlap / tw_range)
-            
-            # Same route bonus
-            same_route = 1.0 if pair_routes.get(pair) == pair_routes.get((removed_pickup, removed_delivery)) else 0.0
-            
-            # Weighted combination
-            relatedness = 0.5 * distance_score + 0.3 * tw_score + 0.2 * same_route
-            total_relatedness += relatedness
+        # Time window overlap
+        tw_overlap = min(ltw[pickup], ltw[other_pickup]) - max(etw[pickup], etw[other_pickup])
+        tw_range = max(ltw[pickup] - etw[pickup], ltw[other_pickup] - etw[other_pickup], 1)
+        tw_score = max(0, tw_overlap / tw_range)
+        
+        # Weighted combination; 0.2 is left for the same route bonus
+        return 0.5 * distance_score + 0.3 * tw_score
+    
+    def _related_pickups(self, pickup: int) -> List[int]:
+        """The SHAW_NEIGHBORS pickups most statically related to pickup, best first"""
+        neighbors = self._shaw_neighbors.get(pickup)
+        if neighbors is None:
+            neighbors = heapq.nlargest(
+                SHAW_NEIGHBORS, (other for other in self._pickups if other != pickup),
+                key=self._relatedness_row(pickup).__getitem__)
+            self._shaw_neighbors[pickup] = neighbors
+        return neighbors
+    
+    def _relatedness_row(self, pickup: int) -> array:
+        """
+        _static_relatedness of every pickup to pickup, indexed by node id
         
-        return total_relatedness / len(removed_pairs)
+        Built on first use, so Shaw removal sums table lookups instead of
+        recomputing the same relatedness on every call. Entries of other
+        nodes are 0.
+        """
+        row = self._shaw_rows.get(pickup)
+        if row is None:
+            row = array('d', bytes(8 * self.instance.size))
+            for other in self._pickups:
+                row[other] = self._static_relatedness(other, pickup)
+            self._shaw_rows[pickup] = row
+        return row
     
     def _worst_removal(self, solution: Solution, k: int) -> List[Tuple[int, int]]:
         """
@@ -376,73 +647,66 @@ class LargeNeighborhoodSearch:
         """
         # Collect all pairs with their removal savings
         pair_savings = []
+        pair_routes = {}
         
-        for route in solution.routes:
+        dem, pair = self._dem, self._pair
+        for route_idx, route in enumerate(solution.routes):
             if not route:
                 continue
             
-            visited_pickups = set()
-            for node_id in route:
-                node = self.instance.nodes[node_id]
-                if node.is_pickup() and node.pair in route:
-                    if node_id not in visited_pickups:
-                        # Calculate cost saving if this pair is removed
-                        saving = self._calculate_pair_removal_saving(route, node_id, node.pair)
-                        pair_savings.append((saving, (node_id, node.pair)))
-                        visited_pickups.add(node_id)
+            path = [0, *route, 0]
+            position = {node_id: pos for pos, node_id in enumerate(route, 1)}
+            # Each pickup occurs once per route, so every pair is seen once
+            for pos, node_id in enumerate(route, 1):
+                if dem[node_id] > 0 and pair[node_id] in position:
+                    # Calculate cost saving if this pair is removed
+                    saving = self._pair_removal_saving(path, pos, position[pair[node_id]])
+                    pair_savings.append((saving, (node_id, pair[node_id])))
+                    pair_routes[node_id, pair[node_id]] = route_idx
         
         if not pair_savings:
             return []
         
-        # Sort by saving (highest first) - these are the "worst" pairs
-        pair_savings.sort(reverse=True)
-        
-        # Take top k pairs
-        k = min(k, len(pair_savings))
-        removed_pairs = [pair for _, pair in pair_savings[:k]]
+        # Top k by saving (highest first) - these are the "worst" pairs; same
+        # order as a full reverse sort
+        removed_pairs = [pair for _, pair in heapq.nlargest(k, pair_savings)]
         
         # Remove from solution
-        for pickup, delivery in removed_pairs:
-            self._remove_nodes_from_solution(solution, [pickup, delivery])
+        self._remove_nodes_from_solution(solution, [node for pair in removed_pairs for node in pair],
+                                         [pair_routes[pair] for pair in removed_pairs])
         
         return removed_pairs
     
-    def _calculate_pair_removal_saving(self, route: List[int], pickup: int, delivery: int) -> float:
+    def _pair_removal_saving(self, path: List[int], pickup_pos: int, delivery_pos: int) -> int:
         """
-        Calculate distance saving if pickup-delivery pair is removed from route
-        Saving = distance_with_pair - distance_without_pair
-        """
-        # Calculate current cost with pair
-        cost_with = self._calculate_route_distance(route)
-        
-        # Calculate cost without pair
-        route_without = [n for n in route if n != pickup and n != delivery]
-        cost_without = self._calculate_route_distance(route_without)
-        
-        return cost_with - cost_without
-    
-    def _calculate_route_distance(self, route: List[int]) -> float:
-        """Calculate total distance of a route"""
-        if not route:
-            return 0
-        
-        distance = 0
-        current = 0  # Depot
+        Distance saving if the pair at the two path positions is removed
         
-        for node_id in route:
-            distance += self.instance.get_travel_time(current, node_id)
-            current = node_id
+        path is the route with the depot at both ends; only the edges around
+        the two nodes change, one bypass each, or a single bypass of both
+        when they are adjacent.
+        """
+        times = self.instance.times
+        first, second = sorted((pickup_pos, delivery_pos))
+        before, first_node = path[first - 1], path[first]
+        second_node, after = path[second], path[second + 1]
         
-        distance += self.instance.get_travel_time(current, 0)  # Return to depot
+        if second == first + 1:
+            return (times[before][first_node] + times[first_node][second_node] + times[second_node][after]
+                    - times[before][after])
         
-        return distance
-    
+        return (times[before][first_node] + times[first_node][path[first + 1]] - times[before][path[first + 1]]
+                + times[path[second - 1]][second_node] + times[second_node][after]
+                - times[path[second - 1]][after])
     
     def _greedy_pair_insertion(self, solution: Solution, removed_pairs: List[Tuple[int, int]]) -> bool:
         """
         Greedy insertion for PICKUP-DELIVERY PAIRS
         For each pair, find the cheapest feasible insertion position
         """
+        # Each insertion changes one route, so only its schedule is rebuilt
+        schedules = [self._route_schedule(route) for route in solution.routes]
+        owned = set()  # route indices already copied (or created) by this repair
+        
         for pickup, delivery in removed_pairs:
             best_cost = float('inf')
             best_route_idx = -1
@@ -450,35 +714,35 @@ class LargeNeighborhoodSearch:
             best_delivery_pos = -1
             
             # Try inserting pair into existing routes
-            for route_idx, route in enumerate(solution.routes):
-                # Try all positions for pickup
-                for pickup_pos in range(len(route) + 1):
-                    # Try all positions for delivery (must be AFTER pickup)
-                    for delivery_pos in range(pickup_pos + 1, len(route) + 2):
-                        # Calculate cost and check feasibility
-                        temp_route = route[:pickup_pos] + [pickup] + route[pickup_pos:delivery_pos] + [delivery] + route[delivery_pos:]
-                        
-                        # Quick feasibility check using local validator
-                        if self._is_route_feasible(temp_route):
-                            cost = self._calculate_pair_insertion_cost(route, pickup, delivery, pickup_pos, delivery_pos)
-                            if cost < best_cost:
-                                best_cost = cost
-                                best_route_idx = route_idx
-                                best_pickup_pos = pickup_pos
-                                best_delivery_pos = delivery_pos
+            for route_idx, schedule in enumerate(schedules):
+                # Feasible (pickup_pos, delivery_pos) with delivery AFTER pickup,
+                # skipping pickup slots that cannot beat the best so far
+                for pickup_pos, delivery_pos, cost in self._feasible_pair_insertions(
+                        schedule, pickup, delivery, lambda: best_cost):
+                    if cost < best_cost:
+                        best_cost = cost
+                        best_route_idx = route_idx
+                        best_pickup_pos = pickup_pos
+                        best_delivery_pos = delivery_pos
             
             # Try creating new route
-            new_route_cost = self._calculate_new_pair_route_cost(pickup, delivery)
+            new_route_cost = self._new_route_cost[pickup]
             
             if best_route_idx == -1 or new_route_cost < best_cost:
                 # Create new route with pair
+                owned.add(len(solution.routes))
                 solution.routes.append([pickup, delivery])
+                schedules.append(self._route_schedule(solution.routes[-1]))
             else:
-                # Insert into existing route (pickup first, then delivery)
-                solution.routes[best_route_idx].insert(best_pickup_pos, pickup)
+                # Insert into existing route (pickup first, then delivery);
+                # the route list may be shared with the incumbent, so the
+                # first insertion into it edits a copy
+                route = self._owned_route(solution, best_route_idx, owned)
+                route.insert(best_pickup_pos, pickup)
                 # Adjust delivery position since we just inserted pickup
                 adjusted_delivery_pos = best_delivery_pos if best_delivery_pos <= best_pickup_pos else best_delivery_pos
-                solution.routes[best_route_idx].insert(adjusted_delivery_pos, delivery)
+                route.insert(adjusted_delivery_pos, delivery)
+                schedules[best_route_idx] = self._route_schedule(route)
         
         return True
     
@@ -491,44 +755,37 @@ class LargeNeighborhoodSearch:
         # Random k for diversity
         k = random.randint(2, 5)
         
+        # Routes only change once per round, after the regret pick, and then
+        # only the route that took the pair needs a new schedule and new
+        # insertion costs; the other routes' costs carry over to the next round
+        schedules = [self._route_schedule(route) for route in solution.routes]
+        owned = set()  # route indices already copied (or created) by this repair
+        route_costs = {pair: [self._pair_insertion_costs(schedule, *pair) for schedule in schedules]
+                       for pair in removed_pairs}
+        
         while removed_pairs:
             pair_regrets = []
             
             for pair in removed_pairs:
                 pickup, delivery = pair
-                costs = []
-                
-                # Find best and 2nd best insertion costs
-                for route_idx, route in enumerate(solution.routes):
-                    for pickup_pos in range(len(route) + 1):
-                        for delivery_pos in range(pickup_pos + 1, len(route) + 2):
-                            temp_route = route[:pickup_pos] + [pickup] + route[pickup_pos:delivery_pos] + [delivery] + route[delivery_pos:]
-                            if self._is_route_feasible(temp_route):
-                                cost = self._calculate_pair_insertion_cost(route, pickup, delivery, pickup_pos, delivery_pos)
-                                costs.append(cost)
                 
-                # Cost of new route
-                costs.append(self._calculate_new_pair_route_cost(pickup, delivery))
+                # Only the k cheapest insertion costs matter, the new route
+                # included; a heap picks them without sorting every position
+                costs = heapq.nsmallest(k, chain(chain.from_iterable(route_costs[pair]),
+                                                 (self._new_route_cost[pickup],)))
                 
-                # Calculate regret-k (difference between best and k-th best)
-                costs.sort()
-                if len(costs) >= k:
-                    regret = costs[k-1] - costs[0]
-                elif len(costs) >= 2:
-                    regret = costs[-1] - costs[0]  # Use worst if less than k options
+                # Calculate regret-k (difference between best and k-th best);
+                # with fewer than k options the worst one stands in
+                if len(costs) >= 2:
+                    regret = costs[-1] - costs[0]
                 else:
-                    regret = costs[0] if costs else float('inf')
+                    regret = costs[0]
                 
                 pair_regrets.append((pair, regret))
             
-            # Sort by regret (descending) - prioritize "difficult" pairs
-            pair_regrets.sort(key=lambda x: x[1], reverse=True)
-            
-            # Insert pair with highest regret
-            if not pair_regrets:
-                break
-            
-            pair_to_insert, _ = pair_regrets[0]
+            # Insert pair with highest regret - prioritize "difficult" pairs;
+            # max keeps the first of tied pairs, as the stable sort did
+            pair_to_insert, _ = max(pair_regrets, key=itemgetter(1))
             pickup, delivery = pair_to_insert
             
             # Find best position for this pair
@@ -537,136 +794,368 @@ class LargeNeighborhoodSearch:
             best_pickup_pos = -1
             best_delivery_pos = -1
             
-            for route_idx, route in enumerate(solution.routes):
-                for pickup_pos in range(len(route) + 1):
-                    for delivery_pos in range(pickup_pos + 1, len(route) + 2):
-                        temp_route = route[:pickup_pos] + [pickup] + route[pickup_pos:delivery_pos] + [delivery] + route[delivery_pos:]
-                        if self._is_route_feasible(temp_route):
-                            cost = self._calculate_pair_insertion_cost(route, pickup, delivery, pickup_pos, delivery_pos)
-                            if cost < best_cost:
-                                best_cost = cost
-                                best_route_idx = route_idx
-                                best_pickup_pos = pickup_pos
-                                best_delivery_pos = delivery_pos
+            for route_idx, schedule in enumerate(schedules):
+                for pickup_pos, delivery_pos, cost in self._feasible_pair_insertions(
+                        schedule, pickup, delivery, lambda: best_cost):
+                    if cost < best_cost:
+                        best_cost = cost
+                        best_route_idx = route_idx
+                        best_pickup_pos = pickup_pos
+                        best_delivery_pos = delivery_pos
             
             # Try new route
-            new_route_cost = self._calculate_new_pair_route_cost(pickup, delivery)
+            new_route_cost = self._new_route_cost[pickup]
             
             if best_route_idx == -1 or new_route_cost < best_cost:
+                owned.add(len(solution.routes))
                 solution.routes.append([pickup, delivery])
+                schedules.append(self._route_schedule(solution.routes[-1]))
+                best_route_idx = len(schedules) - 1
             else:
-                solution.routes[best_route_idx].insert(best_pickup_pos, pickup)
+                route = self._owned_route(solution, best_route_idx, owned)
+                route.insert(best_pickup_pos, pickup)
                 adjusted_delivery_pos = best_delivery_pos if best_delivery_pos <= best_pickup_pos else best_delivery_pos
-                solution.routes[best_route_idx].insert(adjusted_delivery_pos, delivery)
+                route.insert(adjusted_delivery_pos, delivery)
+                schedules[best_route_idx] = self._route_schedule(route)
             
             # Remove inserted pair from list
             removed_pairs.remove(pair_to_insert)
+            del route_costs[pair_to_insert]
+            for pair in removed_pairs:
+                costs_by_route = route_costs[pair]
+                changed_costs = self._pair_insertion_costs(schedules[best_route_idx], *pair)
+                if best_route_idx == len(costs_by_route):
+                    costs_by_route.append(changed_costs)
+                else:
+                    costs_by_route[best_route_idx] = changed_costs
         
         return True
     
+    def _owned_route(self, solution: Solution, route_idx: int, owned: set) -> List[int]:
+        """
+        Route route_idx of solution, safe to edit in place
+        
+        Route lists may be shared with other solutions, so the first call for
+        an index swaps in a copy and records it in owned; later calls in the
+        same repair reuse that copy.
+        """
+        if route_idx not in owned:
+            solution.routes[route_idx] = solution.routes[route_idx][:]
+            owned.add(route_idx)
+        return solution.routes[route_idx]
+    
     def _is_route_feasible(self, route: List[int]) -> bool:
         """Quick feasibility check for a single route"""
         if not route:
             return True
         
+        dem, etw, ltw, dur, pair = self._dem, self._etw, self._ltw, self._dur, self._pair
+        times = self.instance.times
+        capacity = self.instance.capacity
+        n_nodes = len(dem)
+        
         time = 0
         load = 0
         visited_pickups = set()
         prev_node = 0
         
         for node_id in route:
-            if node_id < 0 or node_id >= len(self.instance.nodes):
+            if node_id < 0 or node_id >= n_nodes:
                 return False
             
-            node = self.instance.nodes[node_id]
-            
             # Travel time
-            time += self.instance.get_travel_time(prev_node, node_id)
-            arrival_time = max(time, node.etw)
+            time += times[prev_node][node_id]
+            arrival_time = max(time, etw[node_id])
             
             # Time window check
-            if arrival_time > node.ltw:
+            if arrival_time > ltw[node_id]:
                 return False
             
             # Precedence check
-            if node.is_delivery():
-                if node.pair not in visited_pickups:
-                    return False
+            node_dem = dem[node_id]
+            if node_dem < 0 and pair[node_id] not in visited_pickups:
+                return False
             
             # Capacity check
-            load += node.dem
-            if load > self.instance.capacity or load < 0:
+            load += node_dem
+            if load > capacity or load < 0:
                 return False
             
-            if node.is_pickup():
+            if node_dem > 0:
                 visited_pickups.add(node_id)
             
-            time = arrival_time + node.dur
+            time = arrival_time + dur[node_id]
             prev_node = node_id
         
         # Check return to depot
-        return_time = time + self.instance.get_travel_time(prev_node, 0)
-        return return_time <= self.instance.nodes[0].ltw
+        return_time = time + times[prev_node][0]
+        return return_time <= ltw[0]
+    
+    def _route_schedule(self, route: List[int]) -> Tuple:
+        """
+        Precompute a route once for O(1) pair insertion checks
+        
+        Returns (path, departs, loads, latest_arrival, reach) over the path
+        with the depot at both ends: departure time and load after each
+        position, the latest arrival at each position that still lets the
+        rest of the route finish in time, and the last position up to which
+        the route itself is on time. reach is -1 when the route breaks a
+        node id, precedence or capacity rule, which no insertion can repair.
+        """
+        dem, etw, ltw, dur, pair = self._dem, self._etw, self._ltw, self._dur, self._pair
+        times = self.instance.times
+        capacity = self.instance.capacity
+        path = [0, *route, 0]
+        last = len(route)
+        
+        departs = [0] * (last + 1)
+        loads = [0] * (last + 1)
+        reach = last
+        time = 0
+        load = 0
+        visited_pickups = set()
+        for pos in range(1, last + 1):
+            node_id = path[pos]
+            if node_id < 0 or node_id >= len(dem):
+                return path, departs, loads, None, -1
+            node_dem = dem[node_id]
+            if node_dem < 0 and pair[node_id] not in visited_pickups:
+                return path, departs, loads, None, -1
+            load += node_dem
+            if load > capacity or load < 0:
+                return path, departs, loads, None, -1
+            if node_dem > 0:
+                visited_pickups.add(node_id)
+            loads[pos] = load
+            
+            if reach == last:
+                arrival_time = max(time + times[path[pos - 1]][node_id], etw[node_id])
+                if arrival_time > ltw[node_id]:
+                    reach = pos - 1
+                else:
+                    time = arrival_time + dur[node_id]
+                    departs[pos] = time
+        
+        # Backward pass; -inf marks a suffix that cannot be served at all
+        latest_arrival = [0] * (last + 2)
+        latest_arrival[last + 1] = ltw[0]
+        for pos in range(last, 0, -1):
+            node_id = path[pos]
+            latest_start = min(ltw[node_id], latest_arrival[pos + 1] - times[node_id][path[pos + 1]] - dur[node_id])
+            latest_arrival[pos] = latest_start if etw[node_id] <= latest_start else float('-inf')
+        
+        return path, departs, loads, latest_arrival, reach
+    
+    def _feasible_pair_insertions(self, schedule: Tuple, pickup: int, delivery: int,
+                                  cutoff: Optional[Callable[[], float]] = None):
+        """
+        Yield (pickup_pos, delivery_pos, cost) for each feasible insertion
+        
+        Same candidates and order as the pickup/delivery position loops over
+        temp_route with _is_route_feasible, end slot listed twice included.
+        The prefix comes from the schedule, the times are pushed forward
+        only between the pickup and the delivery, and the suffix is checked
+        against latest_arrival. The pair's demands are assumed to cancel, as
+        they do in every pickup-delivery instance.
+        
+        The cost is the _pair_insertion_delta value, built from the same
+        edges the check walks so that feasibility and pricing are one pass.
+        
+        cutoff, when given, returns the caller's best cost so far; pickup
+        slots whose cost plus the cheapest delivery slot after them cannot
+        go below it are skipped. Both parts are exact, so this only drops
+        candidates a strict "cost < best" search would never take.
+        """
+        path, departs, loads, latest_arrival, reach = schedule
+        etw, ltw, dur = self._etw, self._ltw, self._dur
+        times = self.instance.times
+        capacity = self.instance.capacity
+        last = len(path) - 2
+        
+        pickup_etw, pickup_ltw, pickup_dur = etw[pickup], ltw[pickup], dur[pickup]
+        pickup_dem = self._dem[pickup]
+        delivery_etw, delivery_ltw, delivery_dur = etw[delivery], ltw[delivery], dur[delivery]
+        pickup_row = times[pickup]
+        delivery_row = times[delivery]
+        
+        if cutoff is not None:
+            # Cheapest delivery slot at or after each position, ignoring time
+            # windows: a lower bound on the delivery part of any candidate
+            delivery_floor = [float('inf')] * (last + 2)
+            for pos in range(last, 0, -1):
+                node_row = times[path[pos]]
+                next_node = path[pos + 1]
+                delivery_floor[pos] = min(node_row[delivery] + delivery_row[next_node] - node_row[next_node],
+                                          delivery_floor[pos + 1])
+        
+        # A pickup slot needs the route on time up to it
+        for pickup_pos in range(reach + 1):
+            before_row = times[path[pickup_pos]]
+            after_pickup = path[pickup_pos + 1]
+            if cutoff is not None:
+                if pickup_pos == last:
+                    bound = before_row[pickup] + pickup_row[delivery] + delivery_row[0] - before_row[0]
+                else:
+                    bound = (before_row[pickup] + pickup_row[after_pickup] - before_row[after_pickup]
+                             + delivery_floor[pickup_pos + 1])
+                if bound >= cutoff():
+                    continue
+            
+            arrival_time = max(departs[pickup_pos] + before_row[pickup], pickup_etw)
+            if arrival_time > pickup_ltw:
+                continue
+            time = arrival_time + pickup_dur
+            if loads[pickup_pos] + pickup_dem > capacity:
+                continue
+            
+            if pickup_pos == last:
+                # Only the delivery right behind the pickup is left
+                arrival_time = max(time + pickup_row[delivery], delivery_etw)
+                if (arrival_time <= delivery_ltw and
+                        arrival_time + delivery_dur + delivery_row[0] <= latest_arrival[last + 1]):
+                    yield pickup_pos, last + 1, (before_row[pickup] + pickup_row[delivery] + delivery_row[0]
+                                                 - before_row[0])
+                continue
+            
+            pickup_cost = before_row[pickup] + pickup_row[after_pickup] - before_row[after_pickup]
+            prev_node = pickup
+            for pos in range(pickup_pos + 1, last + 1):
+                # Serve the next route node while carrying the pickup; once
+                # that fails, every later delivery slot fails too
+                node_id = path[pos]
+                arrival_time = max(time + times[prev_node][node_id], etw[node_id])
+                if arrival_time > ltw[node_id] or loads[pos] + pickup_dem > capacity:
+                    break
+                time = arrival_time + dur[node_id]
+                prev_node = node_id
+                
+                # Delivery right after this node, then the unchanged suffix
+                node_row = times[node_id]
+                next_node = path[pos + 1]
+                arrival_time = max(time + node_row[delivery], delivery_etw)
+                if (arrival_time <= delivery_ltw and
+                        arrival_time + delivery_dur + delivery_row[next_node] <= latest_arrival[pos + 1]):
+                    cost = pickup_cost + node_row[delivery] + delivery_row[next_node] - node_row[next_node]
+                    yield pickup_pos, pos, cost
+                    if pos == last:
+                        yield pickup_pos, last + 1, cost
+    
+    def _pair_insertion_costs(self, schedule: Tuple, pickup: int, delivery: int) -> List[float]:
+        """Costs of all feasible insertions of a pair into a scheduled route"""
+        return [cost for _, _, cost in self._feasible_pair_insertions(schedule, pickup, delivery)]
     
     def _calculate_pair_insertion_cost(self, route: List[int], pickup: int, delivery: int,
                                        pickup_pos: int, delivery_pos: int) -> float:
         """Calculate cost of inserting a pickup-delivery pair at given positions"""
-        # Cost is the increase in route travel time
-        original_cost = self._calculate_route_travel_cost(route)
+        return self._pair_insertion_delta([0, *route, 0], pickup, delivery, pickup_pos, delivery_pos)
+    
+    def _pair_insertion_delta(self, path: List[int], pickup: int, delivery: int,
+                              pickup_pos: int, delivery_pos: int) -> int:
+        """
+        Travel time added by inserting a pair, from the edges it replaces
+        
+        path is the route with the depot at both ends. Positions follow the
+        temp_route slicing of the insertion loops: the pickup goes between
+        path[pickup_pos] and path[pickup_pos + 1], the delivery before
+        route[delivery_pos], or at the end when delivery_pos runs past it.
+        """
+        times = self.instance.times
+        before_pickup = path[pickup_pos]
+        after_pickup = path[pickup_pos + 1]
+        pickup_row = times[pickup]
         
-        # Create temporary route with pair inserted
-        temp_route = route[:pickup_pos] + [pickup] + route[pickup_pos:delivery_pos] + [delivery] + route[delivery_pos:]
-        new_cost = self._calculate_route_travel_cost(temp_route)
+        # Delivery slot in path terms; both past-the-end positions append
+        delivery_slot = min(delivery_pos, len(path) - 2)
+        if delivery_slot == pickup_pos:
+            # Delivery right behind the pickup: one edge becomes three
+            return (times[before_pickup][pickup] + pickup_row[delivery] + times[delivery][after_pickup]
+                    - times[before_pickup][after_pickup])
         
-        return new_cost - original_cost
+        before_delivery = path[delivery_slot]
+        after_delivery = path[delivery_slot + 1]
+        return (times[before_pickup][pickup] + pickup_row[after_pickup] - times[before_pickup][after_pickup]
+                + times[before_delivery][delivery] + times[delivery][after_delivery]
+                - times[before_delivery][after_delivery])
     
     def _calculate_route_travel_cost(self, route: List[int]) -> float:
         """Calculate total travel cost for a route"""
         if not route:
             return 0.0
         
-        cost = 0.0
-        prev_node = 0
-        
-        for node_id in route:
-            cost += self.instance.get_travel_time(prev_node, node_id)
-            prev_node = node_id
-        
-        # Return to depot
-        cost += self.instance.get_travel_time(prev_node, 0)
-        return cost
+        # Depot -> route -> depot, summed straight off the matrix rows
+        times = self.instance.times
+        path = [0, *route, 0]
+        return float(sum(map(getitem, map(times.__getitem__, path[:-1]), path[1:])))
     
     def _calculate_new_pair_route_cost(self, pickup: int, delivery: int) -> float:
         """Calculate cost of creating a new route with a single pair"""
         # Depot -> Pickup -> Delivery -> Depot
-        cost = (self.instance.get_travel_time(0, pickup) +
-                self.instance.get_travel_time(pickup, delivery) +
-                self.instance.get_travel_time(delivery, 0))
+        times = self.instance.times
+        cost = times[0][pickup] + times[pickup][delivery] + times[delivery][0]
         
         # Add penalty for creating new vehicle
         vehicle_penalty = 10000  # High penalty to discourage too many vehicles
         return cost + vehicle_penalty
     
-    def _remove_nodes_from_solution(self, solution: Solution, nodes: List[int]):
-        """Remove nodes from solution routes"""
-        try:
-            for node in nodes:
-                for route in solution.routes[:]:
-                    if node in route:
-                        route.remove(node)
-            
-            # Remove empty routes
-            solution.routes = [route for route in solution.routes if route and len(route) > 0]
-        except Exception as e:
-            print(f"Error in _remove_nodes_from_solution: {e}")
+    def _remove_nodes_from_solution(self, solution: Solution, nodes: List[int],
+                                    route_ids: Optional[List[int]] = None):
+        """
+        Remove nodes from solution routes, one filter pass per route
+        
+        Destroy operators pass route_ids, the routes the nodes were found in,
+        so that only those routes are visited; without it every route is.
+        """
+        to_drop = set(nodes)
+        routes = list(solution.routes)
+        touched = range(len(routes)) if route_ids is None else set(route_ids)
+        emptied = route_ids is None  # a full pass also drops routes that were empty
+        for route_idx in touched:
+            route = routes[route_idx]
+            if not to_drop.isdisjoint(route):
+                route = routes[route_idx] = [node for node in route if node not in to_drop]
+                emptied = emptied or not route
+        # Remove empty routes
+        solution.routes = [route for route in routes if route] if emptied else routes
     
     
     def _copy_solution(self, solution: Solution) -> Solution:
         """Create a deep copy of solution"""
+        return solution.clone()
+    
+    def _share_solution(self, solution: Solution) -> Solution:
+        """Shallow copy solution: new routes list, route lists shared by reference"""
         copy_sol = Solution()
         copy_sol.inst_name = solution.inst_name
         copy_sol.authors = solution.authors
         copy_sol.date = solution.date
         copy_sol.reference = solution.reference
-        copy_sol.routes = [route[:] for route in solution.routes]
+        copy_sol.routes = list(solution.routes)
+        # Per-route costs carry over; get_cost re-sums only replaced routes
+        copy_sol._cost_cache = solution._cost_cache
         return copy_sol
+
+
+# Per-process LNS for the trial workers of LargeNeighborhoodSearch.solve
+_trial_lns = None
+
+
+def _init_trial_worker(instance: Instance):
+    """Build the worker's LNS once; the empty start skips the greedy construction"""
+    global _trial_lns
+    _trial_lns = LargeNeighborhoodSearch(instance, initial_solution=Solution())
+
+
+def _run_trial_in_worker(routes: List[List[int]], iteration: int, destroy_op: str, repair_op: str,
+                         destroy_size: int, improve: bool, partial: bool, seed: int):
+    """
+    Run one trial in a worker process
+    
+    Only routes cross the process boundary: a Solution would drag its cost
+    cache, and with it the whole instance, through pickling.
+    """
+    random.seed(seed)
+    current = Solution()
+    current.routes = routes
+    neighbor, is_feasible, violations, trial_time = _trial_lns._run_trial(current, iteration, destroy_op, repair_op,
+                                                                          destroy_size, improve, partial)
+    return (None if neighbor is None else neighbor.routes), is_feasible, violations, trial_time
@@ -4,10 +4,19 @@ Handles the original space-separated format with explicit pickup-delivery pairs
 """
 
 import math
+import re
 from typing import List
 from data_loader import Node, Instance
 
 
+# First-line checks for format detection, see is_li_lim_format
+_SARTORI_HEADER = re.compile(rb'SIZE|CAPACITY')
+_LI_LIM_HEADER = re.compile(rb'\s*[+-]?\d+\s+[+-]?\d+(?:\s|$)')
+
+# Detected format per instance path
+_format_cache = {}
+
+
 def parse_li_lim_instance(filename: str) -> Instance:
     """
     Parse Li & Lim format PDPTW instance
@@ -85,21 +94,10 @@ def parse_li_lim_instance(filename: str) -> Instance:
             
             instance.nodes.append(node)
         
-        # Build Euclidean distance matrix (rounded to integer)
-        instance.times = []
-        for i in range(len(instance.nodes)):
-            row = []
-            for j in range(len(instance.nodes)):
-                if i == j:
-                    row.append(0)
-                else:
-                    # Euclidean distance
-                    dx = instance.nodes[i].x - instance.nodes[j].x
-                    dy = instance.nodes[i].y - instance.nodes[j].y
-                    dist = math.sqrt(dx * dx + dy * dy)
-                    # Round to integer (standard for Li & Lim)
-                    row.append(int(round(dist)))
-            instance.times.append(row)
+        # Build Euclidean distance matrix (rounded to integer);
+        # math.dist does the arithmetic of each entry in C
+        points = [(node.x, node.y) for node in instance.nodes]
+        instance.times = [[round(math.dist(point, other)) for other in points] for point in points]
         
         # Set instance name from filename
         import os
@@ -114,26 +112,22 @@ def is_li_lim_format(filename: str) -> bool:
     
     Li & Lim format starts with: n capacity speed (3 integers)
     Sartori & Buriol format starts with: SIZE: n
+    
+    Only the first line is looked at, and the answer is remembered per
+    path, so batch runs over many instances open each file here once.
     """
+    if filename in _format_cache:
+        return _format_cache[filename]
+    
     try:
-        with open(filename, 'r') as f:
-            first_line = f.readline().strip()
-            
-            # Check if first line has keywords (Sartori format)
-            if 'SIZE' in first_line or 'CAPACITY' in first_line:
-                return False
-            
-            # Check if first line has 3 integers (Li & Lim format)
-            parts = first_line.split()
-            if len(parts) >= 2:
-                # Try to parse as integers
-                try:
-                    int(parts[0])
-                    int(parts[1])
-                    return True
-                except ValueError:
-                    return False
-            
-            return False
-    except Exception:
+        with open(filename, 'rb') as f:
+            first_line = f.read(256).split(b'\n', 1)[0]
+    except OSError:
         return False
+    
+    # Keywords mean Sartori format; otherwise the line must open with two
+    # integers (Li & Lim format)
+    is_li_lim = (_SARTORI_HEADER.search(first_line) is None
+                 and _LI_LIM_HEADER.match(first_line) is not None)
+    _format_cache[filename] = is_li_lim
+    return is_li_lim
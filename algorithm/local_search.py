@@ -4,8 +4,9 @@ Implements various neighborhood structures for improvement algorithms
 """
 
 import random
-import copy
-from typing import List, Tuple, Optional, Set
+from itertools import chain
+from operator import getitem
+from typing import Dict, List, Tuple, Optional, Set
 from data_loader import Instance, Node
 from solution_encoder import Solution
 from construction_heuristic import ConstructionHeuristic
@@ -18,6 +19,14 @@ class LocalSearch:
         self.instance = instance
         self.pair_map = self._build_pair_map()
         
+        # Per-node data as flat lists for the feasibility hot loops
+        self._dem = [node.dem for node in instance.nodes]
+        self._etw = [node.etw for node in instance.nodes]
+        self._ltw = [node.ltw for node in instance.nodes]
+        self._dur = [node.dur for node in instance.nodes]
+        self._pair = [node.pair for node in instance.nodes]
+        self._required_nodes = frozenset(node.idx for node in instance.nodes[1:])  # Exclude depot
+        
     def _build_pair_map(self) -> dict:
         """Build mapping from pickup to delivery nodes and vice versa"""
         pair_map = {}
@@ -28,31 +37,30 @@ class LocalSearch:
     
     def relocate_pickup_delivery_pair(self, solution: Solution, 
                                     pickup_idx: int, delivery_idx: int, 
-                                    target_route_idx: int, position: int) -> Optional[Solution]:
+                                    target_route_idx: int, position: int,
+                                    route_of: Optional[Dict[int, int]] = None) -> Optional[Solution]:
         """
         Relocate a pickup-delivery pair from one route to another route at given position
-        """
-        new_solution = copy.deepcopy(solution)
         
+        route_of, see _route_index, spares the search for the source route
+        when the caller keeps one for the solution.
+        """
         # Find source route and remove the pair
-        source_route_idx = -1
-        pickup_pos_in_source = -1
-        delivery_pos_in_source = -1
-        
-        for route_idx, route in enumerate(new_solution.routes):
-            if pickup_idx in route:
-                pickup_pos_in_source = route.index(pickup_idx)
-                source_route_idx = route_idx
-                
-                # Find delivery position
-                for i, node_idx in enumerate(route):
-                    if node_idx == delivery_idx:
-                        delivery_pos_in_source = i
-                        break
-                break
+        if route_of is not None:
+            source_route_idx = route_of.get(pickup_idx, -1)
+        else:
+            source_route_idx = self._find_route_containing_node(pickup_idx, solution.routes)
         
         if source_route_idx == -1:
             return None
+        
+        route = solution.routes[source_route_idx]
+        pickup_pos_in_source = route.index(pickup_idx)
+        delivery_pos_in_source = route.index(delivery_idx) if delivery_idx in route else -1
+        
+        # Only the source and target routes are edited, so only they are
+        # copied; the target once its index is final, below
+        new_solution = solution.clone_shallow((source_route_idx,))
             
         # Remove pickup and delivery from source route
         source_route = new_solution.routes[source_route_idx]
@@ -76,6 +84,8 @@ class LocalSearch:
             new_solution.routes.append([pickup_idx, delivery_idx])
         else:
             target_route = new_solution.routes[target_route_idx]
+            if target_route is not source_route:
+                target_route = new_solution.routes[target_route_idx] = target_route[:]
             if position > len(target_route):
                 position = len(target_route)
                 
@@ -90,16 +100,18 @@ class LocalSearch:
     
     def _find_best_delivery_position(self, route: List[int], pickup_pos: int, delivery_idx: int) -> int:
         """Find best position to insert delivery node after pickup"""
-        delivery_node = self.instance.nodes[delivery_idx]
-        pickup_node = self.instance.nodes[pickup_idx]
-        
         best_pos = pickup_pos + 1
         
+        # The scan mostly stops at the first position, which a plain check
+        # settles; only a longer scan pays for a schedule and O(1) checks
+        if not self._is_feasible_route(route[:best_pos] + [delivery_idx] + route[best_pos:]):
+            return best_pos
+        schedule = self._route_schedule(route)
+        
         # Try positions after pickup
-        for pos in range(pickup_pos + 1, len(route) + 1):
+        for pos in range(pickup_pos + 2, len(route) + 1):
             # Check feasibility
-            temp_route = route[:pos] + [delivery_idx] + route[pos:]
-            if self._is_feasible_route(temp_route):
+            if self._can_insert(schedule, pos, delivery_idx):
                 best_pos = pos
             else:
                 break
@@ -110,7 +122,8 @@ class LocalSearch:
                                      pair1_pickup: int, pair1_delivery: int,
                                      pair2_pickup: int, pair2_delivery: int) -> Optional[Solution]:
         """Exchange two pickup-delivery pairs between routes"""
-        new_solution = copy.deepcopy(solution)
+        # Both routes are rebuilt as new lists, so no route needs copying
+        new_solution = solution.clone_shallow()
         
         # Find routes containing the pairs
         route1_idx = self._find_route_containing_node(pair1_pickup, new_solution.routes)
@@ -144,18 +157,38 @@ class LocalSearch:
             return route
             
         best_route = route[:]
+        times = self.instance.times
         improved = True
         
         while improved:
             improved = False
+            
+            # Edge costs summed along the route and against it: travel times
+            # need not be symmetric, so a reversed segment's own edges change
+            # too, and both sums give its cost change in O(1)
+            forward = [0]
+            backward = [0]
+            for prev_node, node_id in zip(route, route[1:]):
+                forward.append(forward[-1] + times[prev_node][node_id])
+                backward.append(backward[-1] + times[node_id][prev_node])
+            last = len(route) - 1
+            
             for i in range(1, len(route) - 2):
+                before = times[route[i-1]]
                 for j in range(i + 1, len(route)):
-                    # Create new route by reversing segment i to j
+                    # Cost change of reversing segment i to j; only improving
+                    # reversals are built and checked for feasibility
+                    after = route[j+1] if j < last else 0
+                    delta = (before[route[j]] + times[route[i]][after]
+                             - before[route[i]] - times[route[j]][after]
+                             + backward[j] - backward[i] - forward[j] + forward[i])
+                    if delta >= 0:
+                        continue
+                    
                     new_route = route[:]
                     new_route[i:j+1] = reversed(new_route[i:j+1])
                     
-                    if (self._is_feasible_route(new_route) and 
-                        self._calculate_route_cost(new_route) < self._calculate_route_cost(best_route)):
+                    if self._is_feasible_route(new_route):
                         best_route = new_route
                         route = new_route  # Update for next iteration
                         improved = True
@@ -169,57 +202,158 @@ class LocalSearch:
         """
         OR-opt move: relocate a pickup-delivery pair to different position within same route
         or to different route
+        
+        Best improvement: each sweep prices every relocation of every pair
+        from the cost changes of the routes it touches, with O(1) feasibility
+        checks, and builds only the cheapest; sweeps repeat until none
+        improves. Moves and their results are those of
+        relocate_pickup_delivery_pair.
         """
         best_solution = solution
-        improved = True
+        # A relocation moves both nodes of a pair within the solution, so it
+        # cannot fix or break node coverage; that is checked once, here
+        if not self._visits_all_nodes_once(solution):
+            return None
         
-        while improved:
-            improved = False
+        best_routes = self._summarize_routes(best_solution, {})
+        best_cost = sum(cost for _, cost, _ in best_routes.values())
+        empty_schedule = self._route_schedule([])
+        
+        while True:
+            routes = best_solution.routes
+            summaries = [best_routes[id(route)] for route in routes]
+            # A move only rebuilds its source and target routes, so any other
+            # infeasible route rules it out
+            infeasible = {route_idx for route_idx, (_, _, feasible) in enumerate(summaries) if not feasible}
+            if len(infeasible) > 2:
+                break
+            schedules = [self._route_schedule(route) for route in routes]
+            best_move = None
+            sweep_cost = best_cost
             
             # Try relocating each pair
-            for route_idx, route in enumerate(solution.routes):
-                pairs_in_route = self._get_pickup_delivery_pairs_in_route(route)
-                
-                for pickup_idx, delivery_idx in pairs_in_route:
-                    # Try different positions within same route
-                    for new_position in range(len(route) + 1):
-                        if new_position == self._get_node_position(route, pickup_idx):
-                            continue
-                            
-                        new_sol = self.relocate_pickup_delivery_pair(
-                            best_solution, pickup_idx, delivery_idx, route_idx, new_position
-                        )
-                        
-                        if (new_sol and self._is_valid_solution(new_sol) and 
-                            self._calculate_total_cost(new_sol) < self._calculate_total_cost(best_solution)):
-                            best_solution = new_sol
-                            improved = True
-                            break
+            for route_idx, route in enumerate(routes):
+                for pickup_idx, delivery_idx in self._get_pickup_delivery_pairs_in_route(route):
+                    pickup_position = self._get_node_position(route, pickup_idx)
+                    source = [node for node in route if node != pickup_idx and node != delivery_idx]
+                    emptied = not source or source == [0]
+                    source_schedule = self._route_schedule(source)
+                    source_feasible = emptied or source_schedule[2] == len(source)
+                    # Solution cost with the pair taken out of its route
+                    cost_without_pair = best_cost - summaries[route_idx][1] + self._calculate_route_cost(source)
                     
-                    # Try relocating to different routes
-                    for target_route_idx in range(len(solution.routes)):
-                        if target_route_idx == route_idx:
+                    # Try every position, within the same route or another
+                    for target_route_idx, target_route in enumerate(routes):
+                        # The route the pair actually goes into: the source
+                        # itself, or, once an emptied source is dropped, the
+                        # route after it, or a new one past the last route
+                        if target_route_idx == route_idx and not emptied:
+                            schedule, touched = source_schedule, (route_idx,)
+                            base_cost = best_cost - summaries[route_idx][1]
+                        else:
+                            if not source_feasible:
+                                continue
+                            into_idx = target_route_idx if target_route_idx != route_idx else route_idx + 1
+                            if into_idx < len(routes):
+                                schedule, touched = schedules[into_idx], (route_idx, into_idx)
+                                base_cost = cost_without_pair - summaries[into_idx][1]
+                            else:
+                                schedule, touched = empty_schedule, (route_idx,)
+                                base_cost = cost_without_pair
+                        if not infeasible.issubset(touched):
                             continue
-                            
-                        for position in range(len(solution.routes[target_route_idx]) + 1):
-                            new_sol = self.relocate_pickup_delivery_pair(
-                                best_solution, pickup_idx, delivery_idx, target_route_idx, position
-                            )
-                            
-                            if (new_sol and self._is_valid_solution(new_sol) and 
-                                self._calculate_total_cost(new_sol) < self._calculate_total_cost(best_solution)):
-                                best_solution = new_sol
-                                improved = True
-                                break
+                        base_cost += self._path_cost(schedule[0])
                         
-                        if improved:
-                            break
-                    if improved:
-                        break
-                if improved:
-                    break
+                        for position in range(len(target_route) + 1):
+                            if target_route_idx == route_idx and position == pickup_position:
+                                continue
+                            
+                            added_cost = self._relocation_cost(schedule, min(position, len(schedule[0])),
+                                                               pickup_idx, delivery_idx)
+                            if added_cost is not None and base_cost + added_cost < sweep_cost:
+                                best_move = (pickup_idx, delivery_idx, target_route_idx, position)
+                                sweep_cost = base_cost + added_cost
+            
+            if best_move is None:
+                break
+            
+            best_solution = self.relocate_pickup_delivery_pair(best_solution, *best_move,
+                                                               self._route_index(best_solution))
+            best_routes = self._summarize_routes(best_solution, best_routes)
+            best_cost = sweep_cost
                     
-        return best_solution if best_solution != solution else None
+        return best_solution if best_solution is not solution else None
+    
+    def _relocation_cost(self, schedule: tuple, pos: int, pickup_idx: int, delivery_idx: int) -> Optional[int]:
+        """
+        Path cost added by relocate_pickup_delivery_pair's insertion, None if infeasible
+        
+        The pickup goes in at pos of the scheduled route (see _route_schedule)
+        and the delivery where _find_best_delivery_position puts it: right
+        after the pickup, then as far on as every slot up to it stays
+        feasible. Slots are checked as in _can_insert, walking the shifted
+        times of the nodes the delivery passes.
+        """
+        (route, check_pairs, feasible_prefix, departs, loads,
+         latest_arrival, min_load_from, max_load_from, unmet_from, pickup_pos) = schedule
+        if pos > feasible_prefix:
+            return None
+        
+        times = self.instance.times
+        dem, etw, ltw, dur = self._dem, self._etw, self._ltw, self._dur
+        capacity = self.instance.capacity
+        n = len(route)
+        
+        # The pickup
+        prev_node = route[pos - 1] if pos else 0
+        next_node = route[pos] if pos < n else 0
+        time = (departs[pos - 1] if pos else 0) + times[prev_node][pickup_idx]
+        if time < etw[pickup_idx]:
+            time = etw[pickup_idx]
+        if time > ltw[pickup_idx]:
+            return None
+        time += dur[pickup_idx]
+        load = (loads[pos - 1] if pos else 0) + dem[pickup_idx]
+        if not 0 <= load <= capacity:
+            return None
+        pickup_cost = times[prev_node][pickup_idx] + times[pickup_idx][next_node] - times[prev_node][next_node]
+        
+        # The delivery, after prev_node and before route[slot]; the rest of
+        # the route carries both demands
+        shift = dem[pickup_idx] + dem[delivery_idx]
+        to_delivery = times[delivery_idx]
+        added_cost = None
+        prev_node = pickup_idx
+        for slot in range(pos, n + 1):
+            arrival = time + times[prev_node][delivery_idx]
+            if arrival < etw[delivery_idx]:
+                arrival = etw[delivery_idx]
+            if arrival > ltw[delivery_idx] or not 0 <= load + dem[delivery_idx] <= capacity:
+                break
+            if slot < n and (unmet_from[slot] or min_load_from[slot] + shift < 0
+                             or max_load_from[slot] + shift > capacity
+                             or arrival + dur[delivery_idx] + to_delivery[route[slot]] > latest_arrival[slot]):
+                break
+            
+            next_node = route[slot] if slot < n else 0
+            added_cost = (pickup_cost + times[prev_node][delivery_idx] + to_delivery[next_node]
+                          - times[prev_node][next_node])
+            if slot == n:
+                break
+            
+            # Move the slot past route[slot], now reached through the pickup
+            time += times[prev_node][next_node]
+            if time < etw[next_node]:
+                time = etw[next_node]
+            if time > ltw[next_node]:
+                break
+            time += dur[next_node]
+            load += dem[next_node]
+            if not 0 <= load <= capacity:
+                break
+            prev_node = next_node
+        
+        return added_cost
     
     def _find_route_containing_node(self, node_idx: int, routes: List[List[int]]) -> int:
         """Find route index containing given node"""
@@ -228,22 +362,19 @@ class LocalSearch:
                 return route_idx
         return -1
     
+    def _route_index(self, solution: Solution) -> Dict[int, int]:
+        """Index of the route each node is in; the first one, should a node repeat"""
+        routes = solution.routes
+        return {node_idx: route_idx
+                for route_idx in reversed(range(len(routes))) for node_idx in routes[route_idx]}
+    
     def _get_pickup_delivery_pairs_in_route(self, route: List[int]) -> List[Tuple[int, int]]:
         """Get pickup-delivery pairs found in route"""
-        pairs = []
-        pickup_nodes = []
-        
-        for node_idx in route:
-            node = self.instance.nodes[node_idx]
-            if node.is_pickup():
-                pickup_nodes.append(node_idx)
-                
-        for pickup_idx in pickup_nodes:
-            pickup_node = self.instance.nodes[pickup_idx]
-            if pickup_node.pair in route:
-                pairs.append((pickup_idx, pickup_node.pair))
-                
-        return pairs
+        # One set of the route instead of a list scan per pickup
+        dem, pair = self._dem, self._pair
+        in_route = set(route)
+        return [(node_idx, pair[node_idx]) for node_idx in route
+                if dem[node_idx] > 0 and pair[node_idx] in in_route]
     
     def _get_node_position(self, route: List[int], node_idx: int) -> int:
         """Get position of node in route"""
@@ -264,26 +395,154 @@ class LocalSearch:
     
     def _find_best_insertion_position(self, route: List[int], node_idx: int, is_pickup: bool) -> int:
         """Find best position to insert node in route"""
-        node = self.instance.nodes[node_idx]
         best_pos = 0
         best_cost = float('inf')
+        schedule = self._route_schedule(route, check_pairs=is_pickup)
+        
+        # Insertion cost by edge delta; _calculate_route_cost counts routes of
+        # fewer than two nodes as free, which the two totals keep
+        times = self.instance.times
+        path = [0, *route, 0]
+        full_cost = sum(map(getitem, map(times.__getitem__, path[:-1]), path[1:]))
+        old_cost = full_cost if len(route) > 1 else 0
+        to_node = times[node_idx]
         
         for pos in range(len(route) + 1):
-            temp_route = route[:pos] + [node_idx] + route[pos:]
-            
-            if self._is_feasible_route(temp_route, check_pairs=is_pickup):
-                cost = self._calculate_route_cost(temp_route) - self._calculate_route_cost(route)
+            if self._can_insert(schedule, pos, node_idx):
+                prev_node, next_node = path[pos], path[pos + 1]
+                new_cost = (full_cost + times[prev_node][node_idx] + to_node[next_node]
+                            - times[prev_node][next_node]) if route else 0
+                cost = new_cost - old_cost
                 if cost < best_cost:
                     best_cost = cost
                     best_pos = pos
                     
         return best_pos
     
+    def _route_schedule(self, route: List[int], check_pairs: bool = True) -> tuple:
+        """
+        Forward and backward pass over a route for O(1) insertion checks
+        
+        Returns (route, check_pairs, feasible_prefix, departs, loads,
+        latest_arrival, min_load_from, max_load_from, unmet_from, pickup_pos):
+        the route's first feasible_prefix nodes pass _is_feasible_route's
+        checks, and departs holds their departure times; loads[k] is the load
+        after route[k]; latest_arrival[k] is the latest arrival at route[k]
+        that keeps route[k:] on time, -inf if none does; min/max_load_from[k]
+        bound loads[k:]; unmet_from[k] counts the deliveries in route[k:]
+        whose pickup is not before them; pickup_pos maps each pickup to its
+        first position. See _can_insert.
+        """
+        times = self.instance.times
+        dem, etw, ltw, dur, pair = self._dem, self._etw, self._ltw, self._dur, self._pair
+        capacity = self.instance.capacity
+        n = len(route)
+        
+        # Forward: loads, pickups seen, and how far the route stays feasible
+        loads = []
+        pickup_pos = {}
+        unmet = []
+        load = 0
+        for pos, node_id in enumerate(route):
+            demand = dem[node_id]
+            unmet.append(check_pairs and demand < 0 and pair[node_id] not in pickup_pos)
+            load += demand
+            loads.append(load)
+            if demand > 0:
+                pickup_pos.setdefault(node_id, pos)
+        
+        departs = []
+        time = 0
+        prev_node = 0
+        for pos, node_id in enumerate(route):
+            time += times[prev_node][node_id]
+            arrival_time = time if time > etw[node_id] else etw[node_id]
+            if arrival_time > ltw[node_id] or unmet[pos] or not 0 <= loads[pos] <= capacity:
+                break
+            time = arrival_time + dur[node_id]
+            departs.append(time)
+            prev_node = node_id
+        
+        # Backward: latest arrivals, and suffix load bounds and unmet counts
+        latest_arrival = [0] * n
+        min_load_from = [float('inf')] * (n + 1)
+        max_load_from = [float('-inf')] * (n + 1)
+        unmet_from = [0] * (n + 1)
+        latest = float('inf')
+        next_node = None
+        for pos in range(n - 1, -1, -1):
+            node_id = route[pos]
+            if next_node is not None:
+                latest -= dur[node_id] + times[node_id][next_node]
+            if ltw[node_id] < latest:
+                latest = ltw[node_id]
+            if etw[node_id] > latest:
+                latest = float('-inf')
+            latest_arrival[pos] = latest
+            next_node = node_id
+            
+            load = loads[pos]
+            min_load_from[pos] = min(min_load_from[pos + 1], load)
+            max_load_from[pos] = max(max_load_from[pos + 1], load)
+            unmet_from[pos] = unmet_from[pos + 1] + unmet[pos]
+        
+        return (route, check_pairs, len(departs), departs, loads,
+                latest_arrival, min_load_from, max_load_from, unmet_from, pickup_pos)
+    
+    def _can_insert(self, schedule: tuple, pos: int, node_idx: int) -> bool:
+        """_is_feasible_route of the scheduled route with node_idx inserted at pos, in O(1)"""
+        (route, check_pairs, feasible_prefix, departs, loads,
+         latest_arrival, min_load_from, max_load_from, unmet_from, pickup_pos) = schedule
+        if pos > feasible_prefix:
+            return False
+        
+        demand = self._dem[node_idx]
+        
+        # The inserted node: precedence, capacity and its time window
+        if check_pairs and demand < 0 and pickup_pos.get(self._pair[node_idx], pos) >= pos:
+            return False
+        
+        load = (loads[pos - 1] if pos else 0) + demand
+        if not 0 <= load <= self.instance.capacity:
+            return False
+        
+        times = self.instance.times
+        prev_node = route[pos - 1] if pos else 0
+        time = (departs[pos - 1] if pos else 0) + times[prev_node][node_idx]
+        if time < self._etw[node_idx]:
+            time = self._etw[node_idx]
+        if time > self._ltw[node_idx]:
+            return False
+        
+        if pos == len(route):
+            return True
+        
+        # The rest of the route: shifted loads, its time windows, and
+        # deliveries still lacking their pickup unless it is the inserted one
+        if min_load_from[pos] + demand < 0 or max_load_from[pos] + demand > self.instance.capacity:
+            return False
+        
+        unmet = unmet_from[pos]
+        if unmet and demand > 0:
+            unmet -= sum(1 for later in range(pos, len(route))
+                         if self._pair[route[later]] == node_idx and pickup_pos.get(node_idx, later) >= later
+                         and self._dem[route[later]] < 0)
+        if unmet:
+            return False
+        
+        return time + self._dur[node_idx] + times[node_idx][route[pos]] <= latest_arrival[pos]
+    
     def _is_feasible_route(self, route: List[int], check_pairs: bool = True) -> bool:
         """Check if route satisfies all constraints"""
         if not route:
             return True
             
+        # Bind per-node lists and the matrix to locals; this runs for every
+        # node of every route on each full solution check
+        times = self.instance.times
+        dem, etw, ltw, dur, pair = self._dem, self._etw, self._ltw, self._dur, self._pair
+        capacity = self.instance.capacity
+        
         time = 0
         load = 0
         visited_pickups = set()
@@ -291,30 +550,29 @@ class LocalSearch:
         prev_node = 0  # Start from depot
         
         for node_id in route:
-            node = self.instance.nodes[node_id]
+            demand = dem[node_id]
             
             # Update travel time and check time window
-            time += self.instance.get_travel_time(prev_node, node_id)
-            arrival_time = max(time, node.etw)
+            time += times[prev_node][node_id]
+            arrival_time = time if time > etw[node_id] else etw[node_id]
             
-            if arrival_time > node.ltw:
+            if arrival_time > ltw[node_id]:
                 return False
                 
             # Check pickup-delivery precedence
-            if check_pairs and node.is_delivery():
-                pickup_idx = node.pair
-                if pickup_idx not in visited_pickups:
+            if check_pairs and demand < 0:
+                if pair[node_id] not in visited_pickups:
                     return False
                     
             # Check capacity constraint
-            load += node.dem
-            if load > self.instance.capacity or load < 0:
+            load += demand
+            if load > capacity or load < 0:
                 return False
                 
-            if node.is_pickup():
+            if demand > 0:
                 visited_pickups.add(node_id)
                 
-            time = arrival_time + node.dur
+            time = arrival_time + dur[node_id]
             prev_node = node_id
             
         return True
@@ -323,19 +581,14 @@ class LocalSearch:
         """Calculate total travel cost for a route"""
         if len(route) <= 1:
             return 0
-            
-        total_cost = 0
-        prev_node = 0  # depot
-        
-        for node_id in route:
-            total_cost += self.instance.get_travel_time(prev_node, node_id)
-            prev_node = node_id
-            
-        # Return to depot
-        if route:
-            total_cost += self.instance.get_travel_time(route[-1], 0)
-            
-        return total_cost
+        return self._path_cost(route)
+    
+    def _path_cost(self, route: List[int]) -> int:
+        """Depot -> route -> depot travel time, routes of any length included"""
+        # Summed straight off the matrix rows
+        times = self.instance.times
+        path = [0, *route, 0]
+        return sum(map(getitem, map(times.__getitem__, path[:-1]), path[1:]))
     
     def _calculate_total_cost(self, solution: Solution) -> int:
         """Calculate total cost for entire solution"""
@@ -344,30 +597,74 @@ class LocalSearch:
             total_cost += self._calculate_route_cost(route)
         return total_cost
     
+    def _summarize_routes(self, solution: Solution, known: dict) -> dict:
+        """
+        (route, cost, feasible) per route of the solution, keyed by route identity
+        
+        Entries of known are reused for the routes it holds; each entry keeps
+        its route alive, so an id cannot be recycled while the dict is in use.
+        Routes must not be edited in place while summarized.
+        """
+        summaries = {}
+        for route in solution.routes:
+            entry = known.get(id(route))
+            if entry is None:
+                entry = (route, self._calculate_route_cost(route), self._is_feasible_route(route))
+            summaries[id(route)] = entry
+        return summaries
+    
+    def _valid_solution_cost(self, solution: Solution, known: dict,
+                             check_coverage: bool = True) -> Optional[int]:
+        """
+        _calculate_total_cost of a valid solution, None if it is not valid
+        
+        Same checks as _is_valid_solution, but routes summarized in known, see
+        _summarize_routes, are not walked again; check_coverage=False leaves
+        out the node coverage check, for moves known to keep it.
+        """
+        total_cost = 0
+        for route in solution.routes:
+            entry = known.get(id(route))
+            if entry is not None:
+                _, cost, feasible = entry
+            else:
+                feasible = self._is_feasible_route(route)
+                cost = self._calculate_route_cost(route) if feasible else 0
+            if not feasible:
+                return None
+            total_cost += cost
+        
+        if check_coverage and not self._visits_all_nodes_once(solution):
+            return None
+        return total_cost
+    
     def _is_valid_solution(self, solution: Solution) -> bool:
         """Check if entire solution is valid"""
         # Check all routes are feasible
         for route in solution.routes:
             if not self._is_feasible_route(route):
                 return False
-                
-        # Check all nodes are visited exactly once
-        all_nodes = set()
-        for route in solution.routes:
-            for node_id in route:
-                if node_id in all_nodes:
-                    return False  # Node visited twice
-                all_nodes.add(node_id)
+        
+        return self._visits_all_nodes_once(solution)
+    
+    def _visits_all_nodes_once(self, solution: Solution) -> bool:
+        """Check that every required node is visited, and none twice"""
+        # Check all nodes are visited exactly once: a set the size of the
+        # flattened routes means no node is visited twice
+        flat = list(chain.from_iterable(solution.routes))
+        all_nodes = set(flat)
+        if len(all_nodes) != len(flat):
+            return False  # Node visited twice
                 
         # Check all required nodes are visited
-        required_nodes = set(node.idx for node in self.instance.nodes[1:])  # Exclude depot
-        visited_nodes = all_nodes - {0}  # Exclude depot
-        
-        return required_nodes == visited_nodes
+        all_nodes.discard(0)  # Exclude depot
+        return all_nodes == self._required_nodes
     
     def multi_route_improvement(self, solution: Solution) -> Optional[Solution]:
         """Apply comprehensive local search to improve solution"""
-        improved_solution = copy.deepcopy(solution)
+        # Moves copy the routes they edit and 2-opt returns new lists, so the
+        # routes themselves can be shared
+        improved_solution = solution.clone_shallow()
         
         # Apply OR-opt improvements
         or_opt_result = self.or_opt_pickup_delivery(improved_solution)
@@ -5,6 +5,7 @@ Provides command-line interface to run different algorithms
 """
 
 import argparse
+import logging
 import os
 import sys
 from data_loader import Instance
@@ -200,6 +201,8 @@ def run_benchmark(test_size: str = "small", max_instances: int = 5, output_file:
 
 
 def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     parser = argparse.ArgumentParser(description='PDPTW Algorithm Framework')
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
@@ -4,6 +4,7 @@ Multi-Start ILS - Run multiple independent trials and select best
 Key improvement: Diversification through multiple random seeds
 """
 
+import logging
 import random
 import time
 from typing import Dict, Optional
@@ -150,4 +151,5 @@ def test_multi_start():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     test_multi_start()
@@ -2,6 +2,7 @@
 Quick test script để test ILS ngay trong folder algorithm
 """
 
+import logging
 import os
 import sys
 
@@ -63,5 +64,6 @@ def test_ils():
         traceback.print_exc()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     test_ils()
 
@@ -1,11 +1,14 @@
 """Quick test to verify validator and LNS work correctly"""
 
+import logging
 from data_loader import Instance
 from construction_heuristic import GreedyInsertion
 from solution_encoder import SolutionEncoder
 from feasibility_validator import validate_solution
 from large_neighborhood_search import LargeNeighborhoodSearch
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 # Test on single instance
 instance_file = "../instances/n100/n100/bar-n100-1.txt"
 
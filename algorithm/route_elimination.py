@@ -170,18 +170,98 @@ class RouteElimination:
         best_positions = None
         best_cost = float('inf')
         
-        # Try all valid positions
-        for pickup_pos in range(len(route) + 1):
-            for delivery_pos in range(pickup_pos + 1, len(route) + 2):
-                # Create temp route
-                temp_route = route.copy()
-                temp_route.insert(delivery_pos, delivery_id)
-                temp_route.insert(pickup_pos, pickup_id)
+        # The route is scheduled once: departure and load after each position
+        # going forward, and the latest arrival at each position that still
+        # lets the rest of the route finish going backward. A candidate then
+        # only walks the stretch between its pickup and delivery. The pair's
+        # demands are assumed to cancel, as in every PDPTW instance.
+        nodes = self.instance.nodes
+        times = self.instance.times
+        capacity = self.instance.capacity
+        depot = nodes[0]
+        path = [0, *route, 0]
+        last = len(route)
+        
+        departs = [depot.etw] * (last + 1)
+        loads = [0] * (last + 1)
+        reach = last  # last position the route itself is on time up to
+        visited = set()
+        time = depot.etw
+        load = 0
+        for pos in range(1, last + 1):
+            node_id = path[pos]
+            node = nodes[node_id]
+            # A precedence or capacity break in the route cannot be repaired
+            # by inserting the pair anywhere
+            if node.dem < 0 and node.pair not in visited:
+                return None, float('inf')
+            visited.add(node_id)
+            load += node.dem
+            if load > capacity:
+                return None, float('inf')
+            loads[pos] = load
+            if reach == last:
+                service_start = max(time + times[path[pos - 1]][node_id], node.etw)
+                if service_start > node.ltw:
+                    reach = pos - 1
+                else:
+                    time = service_start + node.dur
+                    departs[pos] = time
+        
+        latest_arrival = [0] * (last + 2)
+        latest_arrival[last + 1] = depot.ltw
+        for pos in range(last, 0, -1):
+            node_id = path[pos]
+            node = nodes[node_id]
+            latest_start = min(node.ltw, latest_arrival[pos + 1] - times[node_id][path[pos + 1]] - node.dur)
+            latest_arrival[pos] = latest_start if node.etw <= latest_start else float('-inf')
+        
+        route_cost = self._calculate_route_cost(route)
+        pickup, delivery = nodes[pickup_id], nodes[delivery_id]
+        pickup_row = times[pickup_id]
+        delivery_row = times[delivery_id]
+        
+        # Same position pairs and order as inserting into a temp route; a
+        # delivery_pos past the end appends like the end slot does and can
+        # never be strictly cheaper, so only the pickup at the end uses it
+        for pickup_pos in range(reach + 1):
+            before_row = times[path[pickup_pos]]
+            service_start = max(departs[pickup_pos] + before_row[pickup_id], pickup.etw)
+            if service_start > pickup.ltw or loads[pickup_pos] + pickup.dem > capacity:
+                continue
+            time = service_start + pickup.dur
+            
+            if pickup_pos == last:
+                service_start = max(time + pickup_row[delivery_id], delivery.etw)
+                if (service_start <= delivery.ltw and
+                        service_start + delivery.dur + delivery_row[0] <= latest_arrival[last + 1]):
+                    cost = route_cost + before_row[pickup_id] + pickup_row[delivery_id] + delivery_row[0] - before_row[0]
+                    if cost < best_cost:
+                        best_cost = cost
+                        best_positions = (pickup_pos, last + 1)
+                continue
+            
+            after_pickup = path[pickup_pos + 1]
+            pickup_cost = route_cost + before_row[pickup_id] + pickup_row[after_pickup] - before_row[after_pickup]
+            prev_node = pickup_id
+            for delivery_pos in range(pickup_pos + 1, last + 1):
+                # Serve the next route node while carrying the pickup; once
+                # that fails, every later delivery position fails too
+                node_id = path[delivery_pos]
+                node = nodes[node_id]
+                service_start = max(time + times[prev_node][node_id], node.etw)
+                if service_start > node.ltw or loads[delivery_pos] + pickup.dem > capacity:
+                    break
+                time = service_start + node.dur
+                prev_node = node_id
                 
-                # Check basic feasibility and calculate cost
-                if self._is_route_feasible_quick(temp_route):
-                    cost = self._calculate_route_cost(temp_route)
-                    
+                # Delivery right after this node, then the unchanged suffix
+                node_row = times[node_id]
+                next_node = path[delivery_pos + 1]
+                service_start = max(time + node_row[delivery_id], delivery.etw)
+                if (service_start <= delivery.ltw and
+                        service_start + delivery.dur + delivery_row[next_node] <= latest_arrival[delivery_pos + 1]):
+                    cost = pickup_cost + node_row[delivery_id] + delivery_row[next_node] - node_row[next_node]
                     if cost < best_cost:
                         best_cost = cost
                         best_positions = (pickup_pos, delivery_pos)
@@ -191,50 +271,6 @@ class RouteElimination:
         
         return best_positions, best_cost
     
-    def _is_route_feasible_quick(self, route: List[int]) -> bool:
-        """Quick feasibility check (pickup before delivery, capacity, time windows)"""
-        if not route:
-            return True
-        
-        # Check pickup before delivery
-        visited = set()
-        for node_id in route:
-            node = self.instance.nodes[node_id]
-            if node.dem < 0:  # Delivery
-                if node.pair not in visited:
-                    return False
-            visited.add(node_id)
-        
-        # Check capacity and time windows
-        depot = self.instance.nodes[0]
-        current_time = depot.etw
-        current_load = 0
-        current_location = 0
-        
-        for node_id in route:
-            node = self.instance.nodes[node_id]
-            
-            # Travel
-            travel_time = self.instance.get_travel_time(current_location, node_id)
-            arrival_time = current_time + travel_time
-            service_start = max(arrival_time, node.etw)
-            
-            # Check time window
-            if service_start > node.ltw:
-                return False
-            
-            # Check capacity
-            current_load += node.dem
-            if current_load > self.instance.capacity:
-                return False
-            
-            current_time = service_start + node.dur
-            current_location = node_id
-        
-        # Return to depot
-        return_time = current_time + self.instance.get_travel_time(current_location, 0)
-        return return_time <= depot.ltw
-    
     def _calculate_route_cost(self, route: List[int]) -> float:
         """Calculate total distance of route"""
         if not route:
@@ -253,10 +289,7 @@ class RouteElimination:
     
     def _copy_solution(self, solution: Solution) -> Solution:
         """Deep copy solution"""
-        new_solution = Solution()
-        new_solution.routes = [route.copy() for route in solution.routes]
-        new_solution.inst_name = solution.inst_name
-        return new_solution
+        return solution.clone()
 
 
 if __name__ == "__main__":
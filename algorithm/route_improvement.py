@@ -4,6 +4,7 @@ Includes: 2-opt, relocate, exchange
 All operators preserve PDPTW feasibility (pickup before delivery)
 """
 
+from operator import getitem
 from typing import List, Tuple, Optional
 from data_loader import Instance, Solution
 from feasibility_validator import validate_solution
@@ -79,24 +80,16 @@ class RouteImprovement:
         best_improvement = 0
         best_i = -1
         best_j = -1
+        times = self.instance.times
         
         for i in range(len(route) - 1):
+            before_row = times[route[i-1] if i > 0 else 0]
             for j in range(i + 2, len(route)):
                 # Calculate current cost
-                if i > 0:
-                    cost_before = self.instance.get_travel_time(route[i-1], route[i])
-                else:
-                    cost_before = self.instance.get_travel_time(0, route[i])
-                
-                cost_before += self.instance.get_travel_time(route[j-1], route[j])
+                cost_before = before_row[route[i]] + times[route[j-1]][route[j]]
                 
                 # Calculate new cost after 2-opt
-                if i > 0:
-                    cost_after = self.instance.get_travel_time(route[i-1], route[j-1])
-                else:
-                    cost_after = self.instance.get_travel_time(0, route[j-1])
-                
-                cost_after += self.instance.get_travel_time(route[i], route[j])
+                cost_after = before_row[route[j-1]] + times[route[i]][route[j]]
                 
                 improvement = cost_before - cost_after
                 
@@ -268,16 +261,20 @@ class RouteImprovement:
         if not route:
             return True
         
+        nodes = self.instance.nodes
+        times = self.instance.times
+        capacity = self.instance.capacity
+        
         time = 0
         load = 0
         visited = set()
         
         prev_node = 0
         for node_id in route:
-            node = self.instance.nodes[node_id]
+            node = nodes[node_id]
             
             # Travel time
-            time += self.instance.get_travel_time(prev_node, node_id)
+            time += times[prev_node][node_id]
             time = max(time, node.etw)
             
             # Time window
@@ -291,7 +288,7 @@ class RouteImprovement:
             
             # Capacity
             load += node.dem
-            if load > self.instance.capacity or load < 0:
+            if load > capacity or load < 0:
                 return False
             
             visited.add(node_id)
@@ -305,20 +302,11 @@ class RouteImprovement:
         if not route:
             return 0
         
-        cost = self.instance.get_travel_time(0, route[0])
-        for i in range(len(route) - 1):
-            cost += self.instance.get_travel_time(route[i], route[i+1])
-        cost += self.instance.get_travel_time(route[-1], 0)
-        
-        return cost
+        # Depot -> route -> depot, summed straight off the matrix rows
+        times = self.instance.times
+        path = [0, *route, 0]
+        return sum(map(getitem, map(times.__getitem__, path[:-1]), path[1:]))
     
     def _copy_solution(self, solution: Solution) -> Solution:
         """Deep copy solution"""
-        from data_loader import Solution as Sol
-        copy_sol = Sol()
-        copy_sol.inst_name = solution.inst_name
-        copy_sol.authors = solution.authors
-        copy_sol.date = solution.date
-        copy_sol.reference = solution.reference
-        copy_sol.routes = [route[:] for route in solution.routes]
-        return copy_sol
+        return solution.clone()
@@ -4,12 +4,15 @@ So sánh 3 phương pháp: Phase 1, Multi-start 15s, Multi-start 30s
 Chạy file này để ra kết quả như trong bảng so sánh
 """
 
+import logging
 import time
 from data_loader import Instance
 from iterated_local_search import IteratedLocalSearch
 from multi_start_ils import MultiStartILS
 from bks_li_lim import LI_LIM_BKS
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 print("="*80)
 print("SO SÁNH 3 PHƯƠNG PHÁP - lc101")
 print("="*80)
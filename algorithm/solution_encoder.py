@@ -72,7 +72,7 @@ class SolutionEncoder:
         solution.authors = authors
         solution.date = ""
         solution.reference = reference
-        solution.routes = [route[:] for route in routes]  # Deep copy
+        solution.routes = list(map(list, routes))  # Deep copy
         return solution
         
     @staticmethod
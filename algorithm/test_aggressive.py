@@ -10,6 +10,7 @@ Improvements:
 - ILS iterations: 20
 """
 
+import logging
 import os
 import sys
 import time
@@ -178,4 +179,5 @@ def test_aggressive():
     print("=" * 80)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     test_aggressive()
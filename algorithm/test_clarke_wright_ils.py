@@ -1,11 +1,14 @@
 """
 Quick test: Clarke-Wright + ILS on lc101
 """
+import logging
 import time
 from data_loader import Instance
 from iterated_local_search import IteratedLocalSearch
 from bks_li_lim import LI_LIM_BKS
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 instance = Instance()
 instance.read_from_file("../instances/pdp_100/lc101.txt")
 
@@ -7,6 +7,7 @@ import os
 import sys
 import time
 import json
+import logging
 from data_loader import Instance
 from iterated_local_search import IteratedLocalSearch
 from bks_li_lim import LI_LIM_BKS
@@ -130,4 +131,5 @@ def test_cw_ultra():
         print(f"{'='*80}")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     test_cw_ultra()
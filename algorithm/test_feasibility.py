@@ -3,6 +3,7 @@ Simple batch test for ILS framework - Focus on FEASIBILITY and STABILITY
 Runs on a SMALL fixed set of instances with detailed logging
 """
 
+import logging
 import os
 import time
 import json
@@ -237,4 +238,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     main()
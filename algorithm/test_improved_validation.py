@@ -3,6 +3,7 @@
 Improved validation test suite with strict feasibility checking
 """
 
+import logging
 import time
 from data_loader import Instance, Solution
 from construction_heuristic import GreedyInsertion
@@ -171,6 +172,7 @@ def run_multiple_tests():
         print(result)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("IMPROVED VALIDATION TEST SUITE")
     print("Testing with strict feasibility checking and sanity bounds")
     run_multiple_tests()
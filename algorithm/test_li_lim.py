@@ -3,6 +3,7 @@ Batch test for Li & Lim PDPTW Benchmark
 Runs ILS+AGES+LNS+LAHC on ALL Li & Lim pdp100 instances
 """
 
+import logging
 import os
 import time
 import json
@@ -405,4 +406,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     main()
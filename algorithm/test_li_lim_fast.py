@@ -4,6 +4,7 @@ Tests a representative SUBSET (10 instances) for quick evaluation
 Time: ~3-5 minutes
 """
 
+import logging
 import os
 import time
 import json
@@ -174,4 +175,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     main()
@@ -1,10 +1,13 @@
 """Quick test on 3 Li & Lim instances to verify everything works"""
 
+import logging
 import os
 import time
 from data_loader import Instance
 from iterated_local_search import IteratedLocalSearch
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 # Test on 3 instances from different classes
 TEST_INSTANCES = [
     "../instances/pdp_100/lc101.txt",
@@ -4,11 +4,14 @@ Multi-Start ILS with 30s per trial
 Enough time for full optimization pipeline
 """
 
+import logging
 import time
 from data_loader import Instance
 from multi_start_ils import MultiStartILS
 from bks_li_lim import LI_LIM_BKS
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 print("="*80)
 print("MULTI-START ILS - 30s per trial")
 print("="*80)
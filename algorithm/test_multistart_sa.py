@@ -4,11 +4,14 @@ Test Multi-Start + SA Vehicles-First on lc101
 Combines two most impactful improvements
 """
 
+import logging
 import time
 from data_loader import Instance
 from multi_start_ils import MultiStartILS
 from bks_li_lim import LI_LIM_BKS
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 print("="*80)
 print("TEST: MULTI-START + SA VEHICLES-FIRST")
 print("="*80)
@@ -6,6 +6,7 @@ Test Phase 1 Improvements on lc101
 3. Worst Removal operator
 4. Variable Regret-k (k=2..5)
 """
+import logging
 import time
 import argparse
 import random
@@ -76,4 +77,5 @@ def main():
         print("FAILED")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     main()
@@ -1,6 +1,7 @@
 """
 FULL TEST - Phase 1 Improvements on 29 instances
 """
+import logging
 import os
 import sys
 import time
@@ -9,6 +10,8 @@ from data_loader import Instance
 from iterated_local_search import IteratedLocalSearch
 from bks_li_lim import LI_LIM_BKS
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 sys.stdout.reconfigure(encoding='utf-8')
 
 target_instances = [
@@ -10,6 +10,7 @@ New improvements:
 - Destroy: 10-60
 """
 
+import logging
 import os
 import sys
 import time
@@ -188,4 +189,5 @@ def test_ultra_aggressive():
     print("=" * 80)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     test_ultra_aggressive()